@@ -33,16 +33,37 @@ __copyright__ = "(c) 2025, Raffaello Bonghi"
 # https://packaging.python.org/guides/distributing-packages-using-setuptools/#choosing-a-versioning-scheme
 __version__ = "0.1.4"
 
-from .main import install  # noqa: F401
-from .ros import rosinstall_reader  # noqa: F401
-from .utilities import Params, RobotList, Robot, get_nanosaur_home, get_nanosaur_docker_user  # noqa: F401
-from .workspace import (
-    get_selected_workspace,
-    get_workspaces_path,
-    get_shared_workspace_path,
-    deploy)  # noqa: F401
-from .prompt_colors import TerminalFormatter  # noqa: F401
-from .variables import (NANOSAUR_DISTRO_MAP,
-    NANOSAUR_CURRENT_DISTRO,
-    NANOSAUR_DOCKER_PACKAGE)  # noqa: F401
+import importlib
+
+# Public names and their submodule, imported on first access (PEP 562)
+_LAZY_ATTRIBUTES = {
+    'install': 'main',
+    'rosinstall_reader': 'ros',
+    'Params': 'utilities',
+    'RobotList': 'utilities',
+    'Robot': 'utilities',
+    'get_nanosaur_home': 'utilities',
+    'get_nanosaur_docker_user': 'utilities',
+    'get_selected_workspace': 'workspace',
+    'get_workspaces_path': 'workspace',
+    'get_shared_workspace_path': 'workspace',
+    'deploy': 'workspace',
+    'TerminalFormatter': 'prompt_colors',
+    'NANOSAUR_DISTRO_MAP': 'variables',
+    'NANOSAUR_CURRENT_DISTRO': 'variables',
+    'NANOSAUR_DOCKER_PACKAGE': 'variables',
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+    # Store the attribute, the next access does not pass from __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
 # EOF
@@ -24,154 +24,392 @@
 # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 # https://gabrieldemarmiesse.github.io/python-on-whales/
+import re
+import json
 import os
+import shutil
 import logging
+import functools
 import subprocess
+import yaml
+from concurrent.futures import ThreadPoolExecutor
+import docker as docker_engine
 from python_on_whales import docker, DockerClient, DockerException
-from nanosaur.utilities import Params, RobotList, get_nanosaur_home, build_env_file
+from nanosaur.utilities import Params, RobotList, get_nanosaur_home, build_env_file_if_stale, YAML_LOADER
 from nanosaur.prompt_colors import TerminalFormatter
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Set up the logger
 logger = logging.getLogger(__name__)
 
+# Map the service status to an emoji
+_STATUS_EMOJI = {
+    "running": "✅",
+    "restarting": "🔄",
+    "paused": "⏸️",
+    "dead": "💀"
+}
+# Bold labels of the services table
+_SERVICES_LABEL = TerminalFormatter.bold("Running services:")
+_SERVICE_LABEL = TerminalFormatter.bold('Service:')
+_CREATED_LABEL = TerminalFormatter.bold('Created: ')
+_FINISHED_LABEL = TerminalFormatter.bold('Finished:')
+
+# Images pulled within this time, in seconds, are not pulled again
+_PULL_CACHE_FILE = ".pull_cache.json"
+_PULL_CACHE_TTL = 24 * 60 * 60
+
+# System folders where the docker CLI looks up the compose plugin
+_COMPOSE_PLUGIN_FOLDERS = (
+    "/usr/local/lib/docker/cli-plugins",
+    "/usr/local/libexec/docker/cli-plugins",
+    "/usr/lib/docker/cli-plugins",
+    "/usr/libexec/docker/cli-plugins",
+)
+
+# Docker Engine API client, created on first use
+_client = None
+
+
+def _engine_client():
+    """Return the Docker Engine API client, connecting to the daemon on first use."""
+    global _client
+    if _client is None:
+        _client = docker_engine.from_env()
+    return _client
+
+
+def _fan_out(function, items, max_workers=8):
+    """Call a blocking function for each item concurrently, return a dictionary item -> result."""
+    items = list(items)
+    if len(items) <= 1:
+        return {item: function(item) for item in items}
+    with ThreadPoolExecutor(max_workers=min(len(items), max_workers)) as executor:
+        return dict(zip(items, executor.map(function, items)))
+
+
+@functools.lru_cache(maxsize=32)
+def _compose_paths(nanosaur_home_path, robot_name):
+    """Return the docker compose file and the robot env file paths, env file is None without a robot."""
+    docker_compose_path = os.path.join(nanosaur_home_path, "docker-compose.yml")
+    env_file_path = os.path.join(nanosaur_home_path, f'{robot_name}.env') if robot_name is not None else None
+    return docker_compose_path, env_file_path
+
+
+@functools.lru_cache(maxsize=8)
+def _compose_client(docker_compose_path, env_file_path, compose_profiles=()):
+    """Return the compose client for these files and profiles, reused across calls."""
+    return DockerClient(compose_files=[docker_compose_path], compose_env_files=[env_file_path], compose_profiles=list(compose_profiles))
+
+
+def _build_env_file(params):
+    """Build the env file if stale and drop the cached compose clients when its content changed."""
+    if build_env_file_if_stale(params):
+        _compose_client.cache_clear()
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_env_file(env_file_path, mtime_ns):
+    """Parse an env file in a dictionary, cached until the file modification time changes."""
+    env = {}
+    with open(env_file_path, 'r') as env_file:
+        for line in env_file:
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            env[key.strip()] = value.strip()
+    return env
+
+
+def _env_values(env_file_path):
+    """Return the variables of an env file, an empty dictionary if the file does not exist."""
+    try:
+        return _parse_env_file(env_file_path, os.stat(env_file_path).st_mtime_ns)
+    except FileNotFoundError:
+        return {}
+
+
+@functools.lru_cache(maxsize=4)
+def _compose_file_name(docker_compose_path, env_file_path, mtime_ns):
+    """Return the top-level name of a compose file, None if not set, cached until the file changes."""
+    try:
+        with open(docker_compose_path, 'rb') as file:
+            compose = yaml.load(file, Loader=YAML_LOADER)
+    except (OSError, yaml.YAMLError):
+        return None
+    name = compose.get('name') if isinstance(compose, dict) else None
+    if name is not None and '$' in str(name):
+        # An interpolated name is resolved by compose with the environment and the env file
+        try:
+            name = _compose_client(docker_compose_path, env_file_path).compose.config(return_json=True).get('name')
+        except DockerException as e:
+            logger.debug(f"Cannot resolve the compose project name: {e}")
+            return None
+    return str(name) if name else None
+
+
+def _compose_project_name(docker_compose_path, env_file_path=None):
+    """Return the compose project name, used by compose to label the containers."""
+    # Same lookup order of compose: environment, env file, compose file name, compose file folder
+    project = os.environ.get('COMPOSE_PROJECT_NAME')
+    if not project and env_file_path is not None:
+        project = _env_values(env_file_path).get('COMPOSE_PROJECT_NAME')
+    if not project:
+        try:
+            project = _compose_file_name(docker_compose_path, env_file_path, os.stat(docker_compose_path).st_mtime_ns)
+        except OSError:
+            project = None
+    if not project:
+        project = os.path.basename(os.path.dirname(os.path.abspath(docker_compose_path)))
+    # Compose normalizes the project name to lowercase letters, digits, dashes and underscores
+    return re.sub(r'[^a-z0-9_-]', '', project.lower())
+
+
+def _parse_docker_time(value):
+    """Convert a Docker Engine API timestamp to an aware datetime, None if never set."""
+    if not value or value.startswith('0001-'):
+        return None
+    return datetime.strptime(value[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+# Time units used to render a delta, from the largest
+_TIME_UNITS = ((86400, "days"), (3600, "hours"), (60, "minutes"))
+
 
 def format_time_delta(delta):
-    if delta.days > 0:
-        return f"{delta.days} days ago"
-    hours, remainder = divmod(delta.seconds, 3600)
-    if hours > 0:
-        return f"{hours} hours ago"
-    minutes, _ = divmod(remainder, 60)
-    return f"{minutes} minutes ago" if minutes > 0 else "just now"
+    seconds = delta.days * 86400 + delta.seconds
+    for unit, label in _TIME_UNITS:
+        if seconds >= unit:
+            return f"{seconds // unit} {label} ago"
+    return "just now"
+
+
+def _container_time(client, container_id):
+    """Return when a running container started or when a stopped container finished, None if unknown."""
+    try:
+        state = client.api.inspect_container(container_id)['State']
+    except docker_engine.errors.DockerException:
+        return None
+    return _parse_docker_time(state.get('StartedAt') if state.get('Running') else state.get('FinishedAt'))
 
 
 def docker_info(params, verbose):
     """Display information about running Docker services."""
-    nanosaur_home_path = get_nanosaur_home()
-    robot = RobotList.current_robot(params)
-    docker_compose_path = os.path.join(nanosaur_home_path, "docker-compose.yml")
-    env_file_path = os.path.join(nanosaur_home_path, f'{robot.name}.env')
-    nanosaur_compose = DockerClient(compose_files=[docker_compose_path], compose_env_files=[env_file_path])
+    robot_name = RobotList.current_robot(params).name if params.get('robots') else None
+    docker_compose_path, env_file_path = _compose_paths(get_nanosaur_home(), robot_name)
+    project = _compose_project_name(docker_compose_path, env_file_path)
 
-    # Get the list of all services, including stopped ones
-    running_services = nanosaur_compose.compose.ps(all=True)
+    # Get the list of all services, including stopped ones, with a single Engine API request
+    try:
+        client = _engine_client()
+        running_services = client.api.containers(all=True, filters={'label': f'com.docker.compose.project={project}'})
+    except docker_engine.errors.DockerException as e:
+        logger.debug(TerminalFormatter.red(f"Error reading Docker services: {e}"))
+        running_services = []
     if not running_services:
         if verbose:
             print()
-            print(TerminalFormatter.color_text("No services are currently running.", bold=True))
+            print(TerminalFormatter.bold("No services are currently running."))
         return
 
+    services = sorted(running_services, key=lambda service: service['Names'][0])
+    # The container list has no start and finish times, inspect the services concurrently
+    times = _fan_out(functools.partial(_container_time, client), [service['Id'] for service in services])
+
     print()
-    print(TerminalFormatter.color_text("Running services:", bold=True))
-    for service in running_services:
-        # Map the service status to an emoji
-        status_emoji = {
-            "running": "✅",
-            "restarting": "🔄",
-            "paused": "⏸️",
-            "dead": "💀"
-        }.get(service.state.status, "❌")
-
-        # Calculate the time since the service was started
-        started_at = datetime.now(service.state.started_at.tzinfo) - service.state.started_at
-        started_at_str = format_time_delta(started_at)
-
-        # Calculate the time since the service was finished, if applicable
-        finished_at_str = "N/A"
-        if service.state.finished_at:
-            finished_at = datetime.now(service.state.finished_at.tzinfo) - service.state.finished_at
-            finished_at_str = format_time_delta(finished_at)
+    print(_SERVICES_LABEL)
+    # A single time reference for all services
+    now = datetime.now(timezone.utc)
+    for service in services:
+        status = service['State']
+        service_name = service['Names'][0].lstrip('/')
+        status_emoji = _STATUS_EMOJI.get(status, "❌")
 
         # Determine the time status based on whether the service is running
-        if service.state.status == "running":
-            time_status = f"{TerminalFormatter.color_text('Created: ', bold=True)} {started_at_str}"
+        time_str = "N/A"
+        if service_time := times.get(service['Id']):
+            time_str = format_time_delta(now - service_time)
+        if status == "running":
+            # Time since the service was started, a restarted container keeps its creation time
+            time_status = f"{_CREATED_LABEL} {time_str}"
         else:
-            time_status = f"{TerminalFormatter.color_text('Finished:', bold=True)} {finished_at_str}"
+            time_status = f"{_FINISHED_LABEL} {time_str}"
 
         # Print the service information
-        print(f"  - [{status_emoji}] {TerminalFormatter.color_text('Service:', bold=True)} {service.name:<35} {time_status}")
+        print(f"  - [{status_emoji}] {_SERVICE_LABEL} {service_name:<35} {time_status}")
+
+
+def _buildx_version():
+    """Return the Docker buildx version, None if not installed."""
+    return docker.buildx.version().split(' ')[-2] if docker.buildx.is_installed() else None
+
+
+def _compose_version():
+    """Return the Docker compose version, None if not installed."""
+    return docker.compose.version().split(' ')[-1] if docker.compose.is_installed() else None
 
 
 def docker_version_info(platform):
     """Print Docker information."""
+    # Run all version probes concurrently, each one waits on its own docker CLI process
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        version_future = executor.submit(docker.version)
+        buildx_future = executor.submit(_buildx_version)
+        compose_future = executor.submit(_compose_version)
+        nvidia_future = executor.submit(check_nvidia_container_cli)
     # Print docker information
-    version_info = docker.version()
-    print(f"{TerminalFormatter.color_text('   Docker version:', bold=True)} {version_info.client.version}")
-    if docker.buildx.is_installed():
-        version = docker.buildx.version().split(' ')[-2]
-        print(f"{TerminalFormatter.color_text('   Docker buildx:', bold=True)} {version}")
+    version_info = version_future.result()
+    print(f"{TerminalFormatter.bold('   Docker version:')} {version_info.client.version}")
+    if version := buildx_future.result():
+        print(f"{TerminalFormatter.bold('   Docker buildx:')} {version}")
     else:
-        print(f"{TerminalFormatter.color_text('   Docker buildx:', bold=True)} {TerminalFormatter.color_text('not installed', color='red', bold=True)}")
-    if docker.compose.is_installed():
-        version = docker.compose.version().split(' ')[-1]
-        print(f"{TerminalFormatter.color_text('   Docker compose:', bold=True)} {version}")
+        print(f"{TerminalFormatter.bold('   Docker buildx:')} {TerminalFormatter.red_bold('not installed')}")
+    if version := compose_future.result():
+        print(f"{TerminalFormatter.bold('   Docker compose:')} {version}")
     else:
-        print(f"{TerminalFormatter.color_text('   Docker compose:', bold=True)} {TerminalFormatter.color_text('not installed', color='red', bold=True)}")
+        print(f"{TerminalFormatter.bold('   Docker compose:')} {TerminalFormatter.red_bold('not installed')}")
 
-    if version := check_nvidia_container_cli():
-        print(f"{TerminalFormatter.color_text('   NVIDIA container:', bold=True)} {version}")
+    if version := nvidia_future.result():
+        print(f"{TerminalFormatter.bold('   NVIDIA container:')} {version}")
     else:
-        print(f"{TerminalFormatter.color_text('   NVIDIA container:', bold=True)} {TerminalFormatter.color_text('not installed', color='red', bold=True)}")
+        print(f"{TerminalFormatter.bold('   NVIDIA container:')} {TerminalFormatter.red_bold('not installed')}")
+
+
+def _compose_plugin_installed():
+    """Return True if the compose plugin is in one of the default folders, without spawning the docker CLI."""
+    docker_config = os.environ.get('DOCKER_CONFIG', os.path.join(os.path.expanduser("~"), ".docker"))
+    return any(os.path.exists(os.path.join(folder, "docker-compose")) for folder in (os.path.join(docker_config, "cli-plugins"), *_COMPOSE_PLUGIN_FOLDERS))
 
 
 def is_docker_installed():
-    if not docker.compose.is_installed():
-        print(TerminalFormatter.color_text("Please install Docker and Docker Compose.", color='red'))
+    # Look up the docker CLI and the compose plugin in the default folders, ask the docker CLI only if not found
+    if shutil.which("docker") is None or not (_compose_plugin_installed() or docker.compose.is_installed()):
+        print(TerminalFormatter.red("Please install Docker and Docker Compose."))
         return False
     if not check_nvidia_container_cli():
-        print(TerminalFormatter.color_text("Please install Nvidia container CLI.", color='red'))
+        print(TerminalFormatter.red("Please install Nvidia container CLI."))
         return False
     return True
 
 
+@functools.lru_cache(maxsize=1)
 def check_nvidia_container_cli():
+    # Look up the binary first, a missing tool does not need a process spawn
+    nvidia_container_cli = shutil.which("nvidia-container-cli")
+    if nvidia_container_cli is None:
+        logger.debug(TerminalFormatter.red("Error: nvidia-container-cli is not installed or not in the PATH."))
+        return None
     try:
-        # Run the command and capture the output
+        # Run the command and capture the output, close_fds=False allows the posix_spawn fast path
         result = subprocess.run(
-            ["nvidia-container-cli", "--version"],
+            [nvidia_container_cli, "--version"],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
+            close_fds=False,
         )
 
         if result.returncode == 0:
             return result.stdout.splitlines()[0].split(' ')[-1]  # Return the first line of the version string
-        logger.debug(TerminalFormatter.color_text("Error:", color='red'), result.stderr.strip())
+        logger.debug(TerminalFormatter.red("Error:"), result.stderr.strip())
         return None
 
     except FileNotFoundError:
-        logger.debug(TerminalFormatter.color_text("Error: nvidia-container-cli is not installed or not in the PATH.", color='red'))
+        logger.debug(TerminalFormatter.red("Error: nvidia-container-cli is not installed or not in the PATH."))
         return None
     except Exception as e:
-        logger.debug(TerminalFormatter.color_text(f"An unexpected error occurred: {e}", color='red'))
+        logger.debug(TerminalFormatter.red(f"An unexpected error occurred: {e}"))
         return None
 
 
+def _load_pull_cache(pull_cache_path):
+    """Load the image -> digest and pull time map, an empty dictionary if missing or broken."""
+    try:
+        with open(pull_cache_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_pull_cache(pull_cache_path, pull_cache):
+    """Save the pull cache, written in a temporary file and replaced."""
+    tmp_path = f"{pull_cache_path}.tmp"
+    try:
+        with open(tmp_path, 'w') as file:
+            json.dump(pull_cache, file)
+        os.replace(tmp_path, pull_cache_path)
+    except OSError as e:
+        logger.debug(TerminalFormatter.red(f"Error saving the pull cache: {e}"))
+
+
+def _local_repo_digests(image):
+    """Return the repository digests of a local image, an empty list if the image is missing."""
+    try:
+        return _engine_client().api.inspect_image(image).get('RepoDigests') or []
+    except docker_engine.errors.DockerException:
+        return []
+
+
+def _is_recently_pulled(image, pull_cache):
+    """Return True if the image has been pulled in the last day and the local image still matches."""
+    entry = pull_cache.get(image)
+    if entry is None or datetime.now(timezone.utc).timestamp() - entry.get('timestamp', 0) > _PULL_CACHE_TTL:
+        return False
+    return entry.get('digest') in _local_repo_digests(image)
+
+
 def docker_pull_images(platform, params: Params, args):
     """Pull a Docker image."""
     nanosaur_home_path = get_nanosaur_home()
     # Create the full file path
     robot = RobotList.current_robot(params)
-    docker_compose_path = os.path.join(nanosaur_home_path, "docker-compose.yml")
-    env_file_path = os.path.join(nanosaur_home_path, f'{robot.name}.env')
+    docker_compose_path, env_file_path = _compose_paths(nanosaur_home_path, robot.name)
     # Determine the device type
     device_type = "robot" if platform['Machine'] == 'aarch64' else "desktop"
 
     # Build env file
-    build_env_file(params)
-    # Create a DockerClient object with the docker-compose file
-    compose_profiles = [device_type]
-    nanosaur_compose = DockerClient(compose_files=[docker_compose_path], compose_env_files=[env_file_path], compose_profiles=compose_profiles)
-    print(TerminalFormatter.color_text("Pulling all Docker images...", bold=True))
+    _build_env_file(params)
+    # Get the compose client with the docker-compose file
+    nanosaur_compose = _compose_client(docker_compose_path, env_file_path, (device_type,))
+    print(TerminalFormatter.bold("Pulling all Docker images..."))
+    pull_cache_path = os.path.join(nanosaur_home_path, _PULL_CACHE_FILE)
+    pull_cache = _load_pull_cache(pull_cache_path)
     try:
-        nanosaur_compose.compose.pull()
+        # Map each service to its image, pull only the images not pulled recently
+        services = nanosaur_compose.compose.config(return_json=True).get('services', {})
+        images = {name: service['image'] for name, service in services.items() if 'image' in service}
+        pending = [name for name, image in images.items() if not _is_recently_pulled(image, pull_cache)]
+        if not pending:
+            print(TerminalFormatter.green("All Docker images are up to date."))
+            return True
+        # Compose pulls the services concurrently with a single progress display,
+        # with the platform of each service and the credentials of the docker CLI
+        nanosaur_compose.compose.pull(services=pending)
     except DockerException as e:
-        print(TerminalFormatter.color_text(f"Error pulling the image: {e}", color='red'))
+        print(TerminalFormatter.red(f"Error pulling the image: {e}"))
         return False
+    # Store the digest of the pulled images
+    for name in pending:
+        if digests := _local_repo_digests(images[name]):
+            pull_cache[images[name]] = {'digest': digests[0], 'timestamp': datetime.now(timezone.utc).timestamp()}
+    _save_pull_cache(pull_cache_path, pull_cache)
     return True
 
 
+def _running_service_container(docker_compose_path, env_file_path, service):
+    """Return the id of the running container of a service, None if there is not exactly one."""
+    project = _compose_project_name(docker_compose_path, env_file_path)
+    # Skip the one-off containers created by compose run, only the service started with compose up is used
+    labels = [f'com.docker.compose.project={project}', f'com.docker.compose.service={service}', 'com.docker.compose.oneoff=False']
+    try:
+        containers = _engine_client().api.containers(filters={'label': labels, 'status': 'running'})
+    except docker_engine.errors.DockerException as e:
+        logger.debug(TerminalFormatter.red(f"Error reading Docker services: {e}"))
+        return None
+    return containers[0]['Id'] if len(containers) == 1 else None
+
+
 def docker_service_run_command(platform, params: Params, service, command=None, name=None, volumes=None):
     """Run a command in the robot container."""
 
@@ -179,103 +417,130 @@ def docker_service_run_command(platform, params: Params, service, command=None,
         command = []
     if volumes is None:
         volumes = []
-    nanosaur_home_path = get_nanosaur_home()
     # Create the full file path
     robot = RobotList.current_robot(params)
-    docker_compose_path = os.path.join(nanosaur_home_path, "docker-compose.yml")
-    env_file_path = os.path.join(nanosaur_home_path, f'{robot.name}.env')
+    docker_compose_path, env_file_path = _compose_paths(get_nanosaur_home(), robot.name)
 
     # Build env file
-    build_env_file(params)
-    # Create a DockerClient object with the docker-compose file
-    nanosaur_compose = DockerClient(compose_files=[docker_compose_path], compose_env_files=[env_file_path])
-    print(TerminalFormatter.color_text(f"Running command in the robot {robot.name} container", color='green'))
+    _build_env_file(params)
+    # Get the compose client with the docker-compose file
+    nanosaur_compose = _compose_client(docker_compose_path, env_file_path)
+    print(TerminalFormatter.green(f"Running command in the robot {robot.name} container"))
+    # Execute the command in the service container if already running, without creating a new container
+    container_id = _running_service_container(docker_compose_path, env_file_path, service) if command and not volumes else None
+    if container_id is not None:
+        try:
+            docker.container.execute(container_id, command, interactive=True, tty=True)
+        except DockerException as e:
+            print(TerminalFormatter.red(f"Error running the command: {e}"))
+            return False
+        return True
     try:
         nanosaur_compose.compose.run(service=service, command=command, remove=True, tty=True, name=name, volumes=volumes)
     except DockerException as e:
-        print(TerminalFormatter.color_text(f"Error running the command: {e}", color='red'))
+        print(TerminalFormatter.red(f"Error running the command: {e}"))
         return False
     return True
 
 
+def _remove_stopped_containers(project, service=None):
+    """Remove the stopped containers of the project and their anonymous volumes, like compose rm."""
+    labels = [f'com.docker.compose.project={project}']
+    if service is not None:
+        labels.append(f'com.docker.compose.service={service}')
+    client = _engine_client()
+    containers = client.api.containers(all=True, filters={'label': labels, 'status': ['created', 'exited', 'dead']})
+    _fan_out(lambda container_id: client.api.remove_container(container_id, v=True), [container['Id'] for container in containers])
+
+
 def docker_robot_start(platform, params: Params, args):
     """Start the docker container."""
-    nanosaur_home_path = get_nanosaur_home()
     # Create the full file path
     robot = RobotList.current_robot(params)
-    docker_compose_path = os.path.join(nanosaur_home_path, "docker-compose.yml")
-    env_file_path = os.path.join(nanosaur_home_path, f'{robot.name}.env')
+    docker_compose_path, env_file_path = _compose_paths(get_nanosaur_home(), robot.name)
 
     # Check which simulation tool is selected only if robot.simulation is true
     if robot.simulation and 'simulation' not in params:
-        print(TerminalFormatter.color_text("No simulation tool selected. Please run 'nanosaur simulation set' first.", color='red'))
+        print(TerminalFormatter.red("No simulation tool selected. Please run 'nanosaur simulation set' first."))
         return False
 
     # Build env file
-    build_env_file(params)
+    _build_env_file(params)
 
-    print(TerminalFormatter.color_text(f"robot {robot.name} starting", color='green'))
+    print(TerminalFormatter.green(f"robot {robot.name} starting"))
 
     compose_profiles = []
     if args.profile:
-        print(TerminalFormatter.color_text(f"Starting with profile: {args.profile}", color='green'))
+        print(TerminalFormatter.green(f"Starting with profile: {args.profile}"))
         compose_profiles = [args.profile]
-    # Create a DockerClient object with the docker-compose file
-    nanosaur_compose = DockerClient(compose_files=[docker_compose_path], compose_env_files=[env_file_path], compose_profiles=compose_profiles)
+    # Get the compose client with the docker-compose file
+    nanosaur_compose = _compose_client(docker_compose_path, env_file_path, tuple(compose_profiles))
+    # Save the parameters before the containers take over the terminal
+    params.save()
     # Start the container in detached mode
     try:
         nanosaur_compose.compose.up(detach=args.detach)
         if not args.detach:
-            nanosaur_compose.compose.rm(volumes=True)
-    except DockerException as e:
-        print(TerminalFormatter.color_text(f"Error starting the robot: {e}", color='red'))
+            _remove_stopped_containers(_compose_project_name(docker_compose_path, env_file_path))
+    except (DockerException, docker_engine.errors.DockerException) as e:
+        print(TerminalFormatter.red(f"Error starting the robot: {e}"))
         return False
 
 
 def docker_simulator_start(platform, params: Params, args):
     """Start the simulation tools."""
-    nanosaur_home_path = get_nanosaur_home()
     # Create the full file path
     robot = RobotList.current_robot(params)
-    docker_compose_path = os.path.join(nanosaur_home_path, "docker-compose.yml")
-    env_file_path = os.path.join(nanosaur_home_path, f'{robot.name}.env')
+    docker_compose_path, env_file_path = _compose_paths(get_nanosaur_home(), robot.name)
 
     # Get the simulation data from the parameters
     simulation_data = params.get('simulation', {})
     # Start the container in detached mode
     simulation_tool = simulation_data['tool'].lower().replace(' ', '-')
-    # Create a DockerClient object with the docker-compose file
-    nanosaur_compose = DockerClient(compose_files=[docker_compose_path], compose_env_files=[env_file_path])
 
     # if len(nanosaur_compose.compose.ps()) > 0:
     #    print(TerminalFormatter.color_text(f"The robot {robot.name} is already running.", color='red'))
     #    return False
 
     # Build env file
-    build_env_file(params)
+    _build_env_file(params)
+    # Get the compose client with the docker-compose file
+    nanosaur_compose = _compose_client(docker_compose_path, env_file_path)
+    # Save the parameters before the simulator takes over the terminal
+    params.save()
 
-    print(TerminalFormatter.color_text(f"Simulator {simulation_tool} starting", color='green'))
+    print(TerminalFormatter.green(f"Simulator {simulation_tool} starting"))
     try:
         nanosaur_compose.compose.up(services=[f'{simulation_tool}'], recreate=False)
-        nanosaur_compose.compose.rm(services=[f'{simulation_tool}'], volumes=True)
-    except DockerException as e:
-        print(TerminalFormatter.color_text(f"Error starting the simulation tool: {e}", color='red'))
+        _remove_stopped_containers(_compose_project_name(docker_compose_path, env_file_path), simulation_tool)
+    except (DockerException, docker_engine.errors.DockerException) as e:
+        print(TerminalFormatter.red(f"Error starting the simulation tool: {e}"))
         return False
 
 
 def docker_robot_stop(platform, params: Params, args):
     """Stop the docker container."""
-    nanosaur_home_path = get_nanosaur_home()
     # Create the full file path
     robot = RobotList.current_robot(params)
-    docker_compose_path = os.path.join(nanosaur_home_path, "docker-compose.yml")
-    env_file_path = os.path.join(nanosaur_home_path, f'{robot.name}.env')
+    docker_compose_path, env_file_path = _compose_paths(get_nanosaur_home(), robot.name)
 
-    # Create a DockerClient object with the docker-compose file
-    nanosaur_compose = DockerClient(compose_files=[docker_compose_path], compose_env_files=[env_file_path])
-    if len(nanosaur_compose.compose.ps()) > 0:
+    project = _compose_project_name(docker_compose_path, env_file_path)
+    # Check with a single Engine API request if the robot is running, compose down is called only when needed
+    try:
+        is_running = bool(_engine_client().api.containers(filters={'label': f'com.docker.compose.project={project}'}))
+    except docker_engine.errors.DockerException as e:
+        logger.debug(TerminalFormatter.red(f"Error reading Docker services: {e}"))
+        is_running = True
+    if not is_running:
+        print(TerminalFormatter.red(f"The robot {robot.name} is not running."))
+        return False
+    # Get the compose client with the docker-compose file
+    nanosaur_compose = _compose_client(docker_compose_path, env_file_path)
+    try:
         nanosaur_compose.compose.down(volumes=True)
-        print(TerminalFormatter.color_text(f"robot {robot.name} stopped", color='green'))
-    else:
-        print(TerminalFormatter.color_text(f"The robot {robot.name} is not running.", color='red'))
+    except DockerException as e:
+        print(TerminalFormatter.red(f"Error stopping the robot: {e}"))
+        return False
+    print(TerminalFormatter.green(f"robot {robot.name} stopped"))
+    return True
 # EOF
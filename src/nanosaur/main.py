@@ -24,33 +24,31 @@
 # OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
 # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import os
+import io
+import sys
+import time
+import json
+import shutil
+import hashlib
+import contextlib
+import platform as system_platform
 import argparse
 import argcomplete
-import sys
-import inquirer
 import logging
-
-import subprocess
-from inquirer.themes import GreenPassion
-from jtop import jtop, JtopException
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, NamedTuple
+from packaging.version import Version, InvalidVersion
 
 from nanosaur import __version__
 import nanosaur.variables as nsv
 from nanosaur.logger_config import setup_logger
-from nanosaur.docker import (
-    docker_info,
-    docker_version_info,
-    is_docker_installed,
-    docker_robot_start,
-    docker_robot_stop,
-    docker_pull_images
-)
-from nanosaur.robot import parser_robot_menu, wizard
+from nanosaur.robot import parser_robot_menu, wizard, robot_start, robot_stop
 from nanosaur.simulation import parser_simulation_menu, simulation_info
 from nanosaur.swarm import parser_swarm_menu
-from nanosaur.prompt_colors import TerminalFormatter
+from nanosaur.prompt_colors import TerminalFormatter, green_theme
 from nanosaur.ros import get_ros2_path
-from nanosaur.utilities import Params, RobotList, package_info, has_internet_connection, get_latest_version
+from nanosaur.utilities import Params, RobotList, package_info, has_internet_connection, get_latest_version, get_nanosaur_home, get_nanosaur_cache
 from nanosaur.workspace import (
     get_nanosaur_version,
     workspaces_info,
@@ -58,100 +56,175 @@ from nanosaur.workspace import (
     create_simple,
     create_developer_workspace,
     create_maintainer_workspace,
-    get_workspaces_path,
+    workspaces_exist,
     requirements_info,
 )
 
+# Set up the logger
+logger = logging.getLogger(__name__)
+
+
+class InstallRule(NamedTuple):
+    """Install option: modes already included, workspace builder, description, color and visibility."""
+    rule: frozenset
+    function: Callable
+    description: str
+    color: str
+    show: bool
+
 
 NANOSAUR_INSTALL_OPTIONS_RULES = {
-    'simple': {
-        'rule': [],
-        'function': create_simple,
-        'description': "Simple workspace with basic tools",
-        'color': 'green',
-        'show': True
-    },
-    'developer': {
-        'rule': ['simple'],
-        'function': create_developer_workspace,
-        'description': "Developer workspace with additional tools",
-        'color': 'blue',
-        'show': True
-    },
-    'maintainer': {
-        'rule': ['simple', 'developer'],
-        'function': create_maintainer_workspace,
-        'description': "Maintainer workspace with additional tools",
-        'color': 'red',
-        'show': True
-    },
-    'Raffo': {
-        'rule': ['simple', 'developer', 'maintainer'],
-        'function': create_maintainer_workspace,
-        'description': "Raffo workspace with additional tools",
-        'color': 'cyan',
-        'show': False
-    },
+    'simple': InstallRule(
+        rule=frozenset(),
+        function=create_simple,
+        description="Simple workspace with basic tools",
+        color='green',
+        show=True,
+    ),
+    'developer': InstallRule(
+        rule=frozenset(['simple']),
+        function=create_developer_workspace,
+        description="Developer workspace with additional tools",
+        color='blue',
+        show=True,
+    ),
+    'maintainer': InstallRule(
+        rule=frozenset(['simple', 'developer']),
+        function=create_maintainer_workspace,
+        description="Maintainer workspace with additional tools",
+        color='red',
+        show=True,
+    ),
+    'Raffo': InstallRule(
+        rule=frozenset(['simple', 'developer', 'maintainer']),
+        function=create_maintainer_workspace,
+        description="Raffo workspace with additional tools",
+        color='cyan',
+        show=False,
+    ),
 }
+# Install options listed to the user
+VISIBLE_INSTALL_OPTIONS = tuple(key for key, value in NANOSAUR_INSTALL_OPTIONS_RULES.items() if value.show)
+
+# Bold labels of the info command
+_INTERNET_LABEL = TerminalFormatter.bold('Internet connection:')
+_VERSION_LABEL = TerminalFormatter.bold('Nanosaur-CLI Version:')
+_MODE_LABEL = TerminalFormatter.bold('Mode: ')
+_DEBUG_LABEL = TerminalFormatter.bold('Default debug: ')
+_PLATFORM_LABEL = TerminalFormatter.bold("\nPlatform Information:")
+_HARDWARE_LABEL = TerminalFormatter.bold("\nHardware Information:")
 
 # Define default parameters
 DEFAULT_PARAMS = {}
 hardware = {}
+# The detected platform is reused for this time, in seconds
+PLATFORM_CACHE_TTL = 24 * 60 * 60
+# Tab completions are reused for this time, in seconds
+COMPLETION_CACHE_TTL = 60 * 60
+# Options of the main parser followed by a value
+OPTIONS_WITH_VALUE = ('--mode', '--default-debug', '-dd', '--log-level')
+# Environment variables of the argcomplete protocol that change the output
+COMPLETION_ENVIRONMENT = ('_ARGCOMPLETE', '_ARGCOMPLETE_IFS', '_ARGCOMPLETE_DFS', '_ARGCOMPLETE_SHELL', 'COMP_TYPE', '_ARGCOMPLETE_STDOUT_FILENAME')
+
+
+def _latest_version():
+    """Return the latest nanosaur release, None if PyPI cannot be reached."""
+    try:
+        return get_latest_version("nanosaur")
+    except (OSError, ValueError) as e:
+        logger.debug(f"Cannot read the latest version: {e}")
+        return None
+
+
+def _is_newer(latest_version, installed_version):
+    """Return True if the latest version is newer than the installed one."""
+    try:
+        return Version(latest_version) > Version(installed_version)
+    except InvalidVersion:
+        return False
+
+
+def _pip_install_command(*arguments):
+    """Return the command installing packages in this interpreter, with uv when available."""
+    if uv := shutil.which('uv'):
+        return [uv, 'pip', 'install', '--python', sys.executable, *arguments]
+    return [sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check', '--no-input', *arguments]
+
+
+def _prefetch_network():
+    """Start the internet check and the latest release lookup in background, return their futures."""
+    executor = ThreadPoolExecutor(max_workers=2)
+    futures = (executor.submit(has_internet_connection), executor.submit(_latest_version))
+    executor.shutdown(wait=False)
+    return futures
 
 
 def info(platform, params: Params, args):
     """Print version information."""
+    # Collect the whole report and write it to the terminal at once
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            _info_report(platform, params, args)
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
+def _info_report(platform, params: Params, args):
+    """Print the version, requirements, robot and workspace information."""
+    from nanosaur.docker import docker_info, docker_version_info
     device_type = "robot" if platform['Machine'] == 'aarch64' else "desktop"
-    internet_connection = has_internet_connection()
-    if internet_connection:
-        latest_version = get_latest_version("nanosaur")
+    # The network requests are started with the CLI, printing the local information meanwhile
+    internet_future, latest_future = getattr(args, 'network', None) or _prefetch_network()
     installed_version = __version__
     # Print version information
     package_info(params, args.verbose)
+    internet_connection = internet_future.result()
+    latest_version = latest_future.result() if internet_connection else None
     # Requirements information
     print()
     if args.verbose:
         status = 'available' if internet_connection else 'not available'
         color = 'green' if internet_connection else 'red'
-        print(f"{TerminalFormatter.color_text('Internet connection:', bold=True)} {TerminalFormatter.color_text(status, color=color)}")
+        print(f"{_INTERNET_LABEL} {TerminalFormatter.color_text(status, color=color)}")
 
     version_str = installed_version
-    if internet_connection:
-        if installed_version < latest_version:
-            version_str = f"{installed_version} {TerminalFormatter.color_text(f'(Update available: {latest_version})', color='yellow')}"
+    if latest_version is not None:
+        if _is_newer(latest_version, installed_version):
+            version_str = f"{installed_version} {TerminalFormatter.yellow(f'(Update available: {latest_version})')}"
         else:
-            version_str = f"{installed_version} {TerminalFormatter.color_text('(up to date)', color='green', bold=True)}"
+            version_str = f"{installed_version} {TerminalFormatter.green_bold('(up to date)')}"
 
-    print(f"{TerminalFormatter.color_text('Nanosaur-CLI Version:', bold=True)} {version_str}")
+    print(f"{_VERSION_LABEL} {version_str}")
     requirements_info(params, args.verbose)
     # Print mode if it exists in params
     if 'mode' in params:
         mode = params['mode']
         if mode in NANOSAUR_INSTALL_OPTIONS_RULES:
-            color = NANOSAUR_INSTALL_OPTIONS_RULES[mode]['color']
+            color = NANOSAUR_INSTALL_OPTIONS_RULES[mode].color
             mode_string = TerminalFormatter.color_text(f"{mode}", color=color, bold=True)
-            print(f"{TerminalFormatter.color_text('Mode: ', bold=True)} {mode_string}")
+            print(f"{_MODE_LABEL} {mode_string}")
     else:
-        print(f"{TerminalFormatter.color_text('Mode: ', bold=True)} {TerminalFormatter.color_text('missing', color='red', bold=True)}")
+        print(f"{_MODE_LABEL} {TerminalFormatter.red_bold('missing')}")
     if 'ws_debug' in params:
-        debug_string = TerminalFormatter.color_text(f"{params['ws_debug']}", color="yellow", bold=True)
-        print(f"{TerminalFormatter.color_text('Default debug: ', bold=True)} {debug_string}")
+        debug_string = TerminalFormatter.yellow_bold(f"{params['ws_debug']}")
+        print(f"{_DEBUG_LABEL} {debug_string}")
     # Print Docker information
     docker_info(params, args.verbose)
-    # Load the robot list
-    robot_list = RobotList.load(params)
+    # Count the robots, the whole list is loaded only to print it
+    robot_count = RobotList.count(params)
     robot_idx = params.get('robot_idx', 0)
     # Print current robot configuration
     print()
-    if robot_list.robots:
-        robot_data = robot_list.get_robot(robot_idx)
-        robot_data.verbose()
+    if robot_count:
+        RobotList.current_robot(params, robot_idx).verbose()
     else:
-        print(TerminalFormatter.color_text("No robot configuration found", color='red'))
+        print(TerminalFormatter.red("No robot configuration found"))
     # Print other robots if they exist
-    if len(robot_list.robots) > 1 or args.verbose:
+    if robot_count > 1 or args.verbose:
         print()
-        robot_list.print_all_robots(robot_idx)
+        RobotList.load(params).print_all_robots(robot_idx)
     # Print simulation tools if they exist
     if device_type == 'desktop':
         print()
@@ -161,20 +234,19 @@ def info(platform, params: Params, args):
     # Print all robot configurations
     if args.verbose:
         # Print device information
-        print(TerminalFormatter.color_text("\nPlatform Information:", bold=True))
-        for key, value in platform.items():
-            print(f"   {TerminalFormatter.color_text(key, bold=True)}: {value}")
+        lines = [_PLATFORM_LABEL] + [f"   {TerminalFormatter.bold(key)}: {value}" for key, value in platform.items()]
+        print("\n".join(lines))
         # Print Docker version information
         docker_version_info(platform)
         if hardware:
-            print(TerminalFormatter.color_text("\nHardware Information:", bold=True))
             # Print specific hardware information
-            for info in ['Module', 'L4T', 'Jetpack']:
-                if info in hardware:
-                    print(f"   {TerminalFormatter.color_text(info, bold=True)}: {hardware[info]}")
+            lines = [_HARDWARE_LABEL] + [f"   {TerminalFormatter.bold(key)}: {hardware[key]}" for key in ['Module', 'L4T', 'Jetpack'] if key in hardware]
+            print("\n".join(lines))
 
 
 def install(platform, params: Params, args):
+    import inquirer
+    from nanosaur.docker import is_docker_installed
     # Check minimal requirements
     if not all([is_docker_installed()]):
         return False
@@ -187,7 +259,7 @@ def install(platform, params: Params, args):
         inquirer.List(
             'choice',
             message="Select the type of installation to perform",
-            choices=[key for key, value in NANOSAUR_INSTALL_OPTIONS_RULES.items() if value['show']],
+            choices=VISIBLE_INSTALL_OPTIONS,
             ignore=lambda answers: args.name is not None,
         ),
         inquirer.Confirm(
@@ -198,30 +270,29 @@ def install(platform, params: Params, args):
         )
     ]
     # Ask the user to select an install type
-    answers = inquirer.prompt(questions, theme=GreenPassion())
+    answers = inquirer.prompt(questions, theme=green_theme())
     install_type = answers['choice'] if answers and answers['choice'] is not None else args.name
     if answers is None:
         return False
     # Check if the user wants to continue
     if answers['confirm'] is False:
-        print(TerminalFormatter.color_text("Installation cancelled", color='yellow'))
+        print(TerminalFormatter.yellow("Installation cancelled"))
         return False
     # Get the selected install type
-    print(TerminalFormatter.color_text(f"Installing {install_type} workspace...", bold=True))
-    if not NANOSAUR_INSTALL_OPTIONS_RULES[install_type]['function'](platform, params, args):
-        print(TerminalFormatter.color_text(f"Installation of {install_type} failed", color='red'))
+    print(TerminalFormatter.bold(f"Installing {install_type} workspace..."))
+    if not NANOSAUR_INSTALL_OPTIONS_RULES[install_type].function(platform, params, args):
+        print(TerminalFormatter.red(f"Installation of {install_type} failed"))
         return False
     # Set params in maintainer mode
     current_mode = params.get('mode', 'simple')
-    if (
-        install_type not in NANOSAUR_INSTALL_OPTIONS_RULES[current_mode]['rule']
-    ):
+    if install_type not in NANOSAUR_INSTALL_OPTIONS_RULES[current_mode].rule:
         params['mode'] = install_type
-    print(TerminalFormatter.color_text(f"Installation of {install_type} workspace complete", color='green'))
+    print(TerminalFormatter.green(f"Installation of {install_type} workspace complete"))
     return True
 
 
 def release_control(platform, params: Params, args):
+    import inquirer
 
     # Get current nanosaur version
     nanosaur_version = params.get('nanosaur_version', nsv.NANOSAUR_CURRENT_DISTRO)
@@ -241,43 +312,49 @@ def release_control(platform, params: Params, args):
             default=lambda answers: answers['tag_version'],
         )
     ]
-    if answers := inquirer.prompt(questions, theme=GreenPassion()):
+    if answers := inquirer.prompt(questions, theme=green_theme()):
         selected_tag = answers['tag_name']
         params.set('nanosaur_version', selected_tag)
-        print(TerminalFormatter.color_text(f"Selected Nanosaur version: {selected_tag}", bold=True))
+        print(TerminalFormatter.bold(f"Selected Nanosaur version: {selected_tag}"))
     return True
 
 
 def update(platform, params: Params, args):
+    import subprocess
+    import inquirer
+    from nanosaur.docker import docker_pull_images
 
     package_name = 'nanosaur'
 
     def prompt_user(message):
         """Prompt the user for confirmation."""
         questions = [inquirer.Confirm('confirm', message=message, default=True)]
-        answers = inquirer.prompt(questions, theme=GreenPassion())
+        answers = inquirer.prompt(questions, theme=green_theme())
         return answers['confirm'] if answers else False
 
     if not has_internet_connection():
-        print(TerminalFormatter.color_text("No internet connection", color='red'))
+        print(TerminalFormatter.red("No internet connection"))
         return False
 
     installed_version = __version__
-    latest_version = get_latest_version(package_name)
+    # Always ask PyPI, a release may be just published
+    latest_version = get_latest_version(package_name, use_cache=False)
 
     if installed_version is None:
         if args.yes or prompt_user(f"{package_name} is not installed. Install now?"):
-            print(TerminalFormatter.color_text(f"Installing {package_name}...", bold=True))
-            subprocess.check_call([sys.executable, "-m", "pip", "install", package_name])
-    elif installed_version < latest_version:
+            print(TerminalFormatter.bold(f"Installing {package_name}..."))
+            subprocess.check_call(_pip_install_command(package_name), close_fds=False)
+    elif latest_version is None:
+        print(TerminalFormatter.red(f"Cannot read the latest version of {package_name}"))
+    elif _is_newer(latest_version, installed_version):
         if args.yes or prompt_user(f"Update {package_name} from {installed_version} to {latest_version}?"):
-            print(TerminalFormatter.color_text(f"Updating {package_name} from {installed_version} to {latest_version}...", bold=True))
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", package_name])
+            print(TerminalFormatter.bold(f"Updating {package_name} from {installed_version} to {latest_version}..."))
+            subprocess.check_call(_pip_install_command("--upgrade", package_name), close_fds=False)
     else:
-        print(TerminalFormatter.color_text(f"{package_name} is already up to date ({installed_version}).", color='green', bold=True))
+        print(TerminalFormatter.green_bold(f"{package_name} is already up to date ({installed_version})."))
 
     if (args.yes or prompt_user("Do you want to pull all Docker images?")) and docker_pull_images(platform, params, args):
-        print(TerminalFormatter.color_text("Docker images pulled successfully", color='green'))
+        print(TerminalFormatter.green("Docker images pulled successfully"))
 
     return True
 
@@ -289,63 +366,206 @@ def nanosaur_wake_up(platform, params: Params, args):
     # Start the container in detached mode
     simulation_tool = simulation_data.get('tool', '').lower().replace(' ', '-')
     args.profile = simulation_tool
-    return docker_robot_start(platform, params, args)
+    return robot_start(platform, params, args)
 
 
 def robot_control(params, subparsers):
     robot = RobotList.current_robot(params).name
-    robot_name = TerminalFormatter.color_text(robot, color='green', bold=True)
+    robot_name = TerminalFormatter.green_bold(robot)
     parser_wakeup = subparsers.add_parser('wake-up', help=f"Start {robot_name} (same as 'nanosaur robot start')")
     parser_wakeup.set_defaults(func=nanosaur_wake_up)
     # Subcommand: shutdown
     parser_shutdown = subparsers.add_parser('shutdown', help="Shutdown the robot (same as 'nanosaur robot stop')")
-    parser_shutdown.set_defaults(func=docker_robot_stop)
+    parser_shutdown.set_defaults(func=robot_stop)
 
 
-def main():
-    # Load the parameters
-    params = Params.load(DEFAULT_PARAMS)
-    # Get current nanosaur version
-    nanosaur_version = get_nanosaur_version(params, verbose=True)
-    # Get the ROS distro
-    ros_distro = nsv.NANOSAUR_DISTRO_MAP[nanosaur_version]['ros']
-    # Get the ROS 2 installation path if available
-    ros2_installed = get_ros2_path(ros_distro)
+def _read_system_file(path):
+    """Return the content of a system file, an empty string if not readable."""
+    try:
+        with open(path, 'r') as file:
+            return file.read().strip('\x00\n ')
+    except OSError:
+        return ''
 
-    # Extract device information with jtop
+
+def _detect_platform():
+    """Return the platform and hardware information from the system files, without the jtop service."""
+    cache_path = os.path.join(get_nanosaur_cache(), 'platform.json')
+    try:
+        if time.time() - os.stat(cache_path).st_mtime < PLATFORM_CACHE_TTL:
+            with open(cache_path, 'r') as file:
+                data = json.load(file)
+            return data['platform'], data['hardware']
+    except (OSError, ValueError, KeyError):
+        pass
+    # Same platform fields of jtop
+    os_release = dict(line.split('=', 1) for line in _read_system_file('/etc/os-release').splitlines() if '=' in line)
+    distribution = " ".join(os_release[key].strip('"') for key in ('NAME', 'VERSION_ID', 'VERSION_CODENAME') if key in os_release)
+    platform = {
+        'Machine': system_platform.machine(),
+        'System': system_platform.system(),
+        'Distribution': distribution,
+        'Release': system_platform.release(),
+        'Python': system_platform.python_version(),
+    }
+    hardware = {}
+    if platform['Machine'] == 'aarch64':
+        if model := _read_system_file('/proc/device-tree/model'):
+            hardware['Module'] = model
+        # Format: "# R36 (release), REVISION: 4.0, GCID: ..."
+        nv_tegra_release = _read_system_file('/etc/nv_tegra_release').split(', ')
+        if len(nv_tegra_release) > 1:
+            l4t_release = nv_tegra_release[0].lstrip('# R').split(' ')[0]
+            l4t_revision = nv_tegra_release[1].replace('REVISION: ', '')
+            hardware['L4T'] = f"{l4t_release}.{l4t_revision}"
+            try:
+                from jtop.core.jetson_variables import NVIDIA_JETPACK
+                hardware['Jetpack'] = NVIDIA_JETPACK.get(hardware['L4T'], '')
+            except ImportError:
+                pass
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(f"{cache_path}.tmp", 'w') as file:
+            json.dump({'platform': platform, 'hardware': hardware}, file)
+        os.replace(f"{cache_path}.tmp", cache_path)
+    except OSError:
+        pass
+    return platform, hardware
+
+
+def _jtop_platform(platform, hardware):
+    """Return the full platform and hardware information from the jtop service, the detected ones if not available."""
+    try:
+        from jtop import jtop, JtopException
+    except ImportError:
+        return platform, hardware
     try:
         with jtop() as device:
             if device.ok():
                 platform = device.board['platform']
-                if platform['Machine'] == 'aarch64':
-                    global hardware
-                    hardware = device.board['hardware']
+                hardware = device.board['hardware'] if platform['Machine'] == 'aarch64' else {}
     except JtopException as e:
-        print(f"Error: {e}")
-        sys.exit(1)
+        logger.debug(f"jtop not available: {e}")
+    return platform, hardware
+
+
+def _selected_command():
+    """Return the subcommand written on the command line, or in the line to complete, None if not written yet."""
+    if '_ARGCOMPLETE' in os.environ:
+        comp_line = os.environ.get('COMP_LINE', '')
+        words = comp_line[:int(os.environ.get('COMP_POINT', len(comp_line)))].split()[1:]
+    else:
+        words = sys.argv[1:]
+    skip_value = False
+    for word in words:
+        if skip_value:
+            skip_value = False
+        elif word in OPTIONS_WITH_VALUE:
+            skip_value = True
+        elif not word.startswith('-'):
+            return word
+    return None
+
+
+def _completion_cache_path():
+    """Return the cache file of the current tab completion request, None if it must not be cached."""
+    comp_line = os.environ.get('COMP_LINE', '')
+    comp_point = int(os.environ.get('COMP_POINT', len(comp_line)))
+    # Completions of a path are read from the file system
+    if os.sep in comp_line[:comp_point].split(' ')[-1]:
+        return None
+    # The parser depends on the parameters, the workspaces and the ROS installation, the files on the working folder
+    stamps = []
+    for path in (Params.get_params_file(), get_nanosaur_home(), os.getcwd(), '/opt/ros'):
+        try:
+            stamps.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamps.append(None)
+    # The output file is a new temporary file on every request, only its use changes the key
+    environment = [os.environ.get(name) if name != '_ARGCOMPLETE_STDOUT_FILENAME' else name in os.environ for name in COMPLETION_ENVIRONMENT]
+    key = json.dumps([__version__, os.getcwd(), comp_line, comp_point, stamps, environment])
+    return os.path.join(get_nanosaur_cache(), f"completion-{hashlib.sha1(key.encode()).hexdigest()}")
+
+
+def _completion_output():
+    """Open the argcomplete output like argcomplete does, the file set by the shell or the file descriptor 8."""
+    filename = os.environ.get('_ARGCOMPLETE_STDOUT_FILENAME')
+    if filename is not None:
+        return open(filename, 'w')
+    return os.fdopen(8, 'w')
+
+
+def _serve_cached_completion(cache_path):
+    """Write the cached completions on the argcomplete output and exit, return if not cached."""
+    try:
+        if time.time() - os.stat(cache_path).st_mtime > COMPLETION_CACHE_TTL:
+            return
+        with open(cache_path, 'r') as file:
+            completions = file.read()
+        with _completion_output() as output_stream:
+            output_stream.write(completions)
+    except OSError:
+        return
+    os._exit(0)
+
+
+def _autocomplete(parser, cache_path):
+    """Run argcomplete and store the completions in the cache."""
+    if cache_path is None:
+        argcomplete.autocomplete(parser)
+        return
+    output_stream = io.StringIO()
+    try:
+        argcomplete.autocomplete(parser, output_stream=output_stream, exit_method=sys.exit)
+        return
+    except SystemExit as e:
+        exit_code = e.code or 0
+    completions = output_stream.getvalue()
+    if exit_code == 0:
+        try:
+            cache_folder = os.path.dirname(cache_path)
+            os.makedirs(cache_folder, exist_ok=True)
+            # Drop the expired completions
+            for entry in os.scandir(cache_folder):
+                if entry.name.startswith('completion-') and time.time() - entry.stat().st_mtime > COMPLETION_CACHE_TTL:
+                    os.remove(entry.path)
+            with open(f"{cache_path}.tmp", 'w') as file:
+                file.write(completions)
+            os.replace(f"{cache_path}.tmp", cache_path)
+        except OSError:
+            pass
+    try:
+        with _completion_output() as output:
+            output.write(completions)
+    except OSError:
+        exit_code = 1
+    os._exit(exit_code)
 
+
+def _new_parser(platform, params: Params, mode, nanosaur_version, ros2_installed, selected_command):
+    """Build the argument parser, the sub-menus are fully built only for the selected command."""
     # Determine the device type
     device_type = "robot" if platform['Machine'] == 'aarch64' else "desktop"
 
-    nanosaur_green = TerminalFormatter.color_text("nanosaur", color='green', bold=True)
+    nanosaur_green = TerminalFormatter.green_bold("nanosaur")
     # Create the argument parser
     parser = argparse.ArgumentParser(
         description=f"Nanosaur CLI - A command-line interface for the {nanosaur_green} robot.")
     # Add version argument
     parser.add_argument('--version', '-v', action='version', version=__version__)
     # Add hidden arguments
-    current_mode = params.get('mode', 'simple')
-    color = NANOSAUR_INSTALL_OPTIONS_RULES[current_mode]['color']
+    current_mode = mode or 'simple'
+    color = NANOSAUR_INSTALL_OPTIONS_RULES[current_mode].color
     current_mode_string = TerminalFormatter.color_text(current_mode, color=color, bold=True)
     # Specify the mode of operation of the nanosaur cli
     parser.add_argument('--mode', type=str, help=f"Specify the mode of operation [{current_mode_string}]")
     # Specify if the debug running by default in host or docker otherwise is always asked
     if ros2_installed is not None:
         current_ws_debug = params.get('ws_debug', 'NO SELECTED')
-        current_ws_debug_string = TerminalFormatter.color_text(current_ws_debug, bold=True)
+        current_ws_debug_string = TerminalFormatter.bold(current_ws_debug)
         parser.add_argument('--default-debug', '-dd', type=str, choices=['host', 'docker'], help=f"Select the debug mode [{current_ws_debug_string}]")
     # Add the log level argument, in Raffo mode is always showed otherwise is hidden
-    if 'mode' in params and params['mode'] in ['Raffo']:
+    if mode == 'Raffo':
         help_message = "Set the log level (default: INFO)"
     else:
         help_message = argparse.SUPPRESS
@@ -358,6 +578,7 @@ def main():
     )
     # Define subcommands
     subparsers = parser.add_subparsers(dest='command', help="Available commands")
+    menus = {}
 
     # Subcommand: info
     parser_info = subparsers.add_parser('info', help="Show version information")
@@ -365,7 +586,7 @@ def main():
     parser_info.set_defaults(func=info)
 
     # Subcommand: install (hidden if workspace already exists)
-    if 'mode' not in params or params['mode'] not in ['maintainer']:
+    if mode != 'maintainer':
         parser_install = subparsers.add_parser('install', help=f"Install nanosaur on your {device_type}")
     else:
         parser_install = subparsers.add_parser('install')
@@ -376,50 +597,84 @@ def main():
     parser_install.add_argument('name', type=str, nargs='?', help="Specify the name for the installation")
     parser_install.set_defaults(func=install)
     # Subcommand: release control
-    if 'mode' in params:
-        nanosaur_version_str = TerminalFormatter.color_text(nanosaur_version, bold=True)
+    if mode is not None:
+        nanosaur_version_str = TerminalFormatter.bold(nanosaur_version)
         parser_release = subparsers.add_parser('release', help=f"Control the release version [{nanosaur_version_str}]")
         parser_release.add_argument('name', type=str, nargs='?', help="Specify the release name")
         parser_release.set_defaults(func=release_control)
 
-    if 'mode' in params:
+    if mode is not None:
         parser_update = subparsers.add_parser('update', help="Update nanosaur to the latest version")
         parser_update.add_argument('-y', '--yes', action='store_true', help="Skip confirmation prompt")
         parser_update.set_defaults(func=update)
 
+    # The sub-menus are fully built only for the selected command, the others list only their help
+
     # Subcommand: workspace (with a sub-menu for workspace operations)
-    if get_workspaces_path(params):
+    if workspaces_exist(params):
         # Add workspace subcommand
-        parser_workspace = parser_workspace_menu(subparsers, params)
+        menus['workspace'] = parser_workspace_menu(subparsers, params, stub=selected_command not in ['workspace', 'ws'])
 
     # Subcommand: simulation (with a sub-menu for simulation types)
-    if device_type == 'desktop' and 'mode' in params:
+    if device_type == 'desktop' and mode is not None:
         # Add simulation subcommand
-        parser_simulation = parser_simulation_menu(subparsers, params)
+        menus['simulation'] = parser_simulation_menu(subparsers, params, stub=selected_command not in ['simulation', 'sim'])
 
     # Add robot subcommand
-    parser_robot, parser_config = parser_robot_menu(platform, subparsers, params)
+    menus['robot'], menus['config'] = parser_robot_menu(platform, subparsers, params, stub=selected_command != 'robot')
 
     if device_type == 'desktop':
         # Subcommand: swarm (with a sub-menu for swarm operations)
-        parser_swarm = parser_swarm_menu(subparsers, params)
+        menus['swarm'] = parser_swarm_menu(subparsers, params, stub=selected_command != 'swarm')
 
     # Subcommand: wakeup (with a sub-menu for wakeup operations)
-    if 'mode' in params and 'robots' in params:
+    if mode is not None and 'robots' in params:
         robot_control(params, subparsers)
 
+    return parser, menus
+
+
+def main():
+    # Serve the tab completion from the cache, before loading the parameters and building the parser
+    completion_cache = _completion_cache_path() if '_ARGCOMPLETE' in os.environ else None
+    if completion_cache is not None:
+        _serve_cached_completion(completion_cache)
+    selected_command = _selected_command()
+    # Start the network requests of the info command, they run while the parser is built
+    network = _prefetch_network() if selected_command == 'info' and '_ARGCOMPLETE' not in os.environ else None
+    # Load the parameters
+    params = Params.load(DEFAULT_PARAMS)
+    # Read the mode once, None when the CLI is not installed yet
+    mode = params.get('mode')
+    # Get current nanosaur version
+    nanosaur_version = get_nanosaur_version(params, verbose=True)
+    # Get the ROS distro
+    ros_distro = nsv.NANOSAUR_DISTRO_MAP[nanosaur_version]['ros']
+    # Get the ROS 2 installation path if available
+    ros2_installed = get_ros2_path(ros_distro)
+
+    # Extract device information from the system files
+    global hardware
+    platform, hardware = _detect_platform()
+
+    # Create the argument parser
+    parser, menus = _new_parser(platform, params, mode, nanosaur_version, ros2_installed, selected_command)
+
     # Enable tab completion
-    argcomplete.autocomplete(parser)
+    _autocomplete(parser, completion_cache)
     # Parse the arguments
     args = parser.parse_args()
 
     # Set up logger with the specified level
     log_level = getattr(logging, args.log_level.upper(), logging.INFO)
-    if 'mode' in params and params['mode'] in ['Raffo']:
+    if mode == 'Raffo':
         log_level = logging.DEBUG
     setup_logger(level=log_level)
-    # Get the logger for the main script
-    logging.getLogger(__name__)
+
+    args.network = network
+    # Read the full board information from jtop only to show it
+    if args.command == 'info' and args.verbose:
+        platform, hardware = _jtop_platform(platform, hardware)
 
     # Override mode if provided as an argument
     if args.mode:
@@ -428,20 +683,20 @@ def main():
     # Print all arguments
     if hasattr(args, 'default_debug') and args.default_debug is not None:
         params.set('ws_debug', args.default_debug)
-        print(TerminalFormatter.color_text(f"Debug mode: {args.default_debug}", bold=True))
+        print(TerminalFormatter.bold(f"Debug mode: {args.default_debug}"))
         return True
 
     # Handle subcommands without a specific type
     if args.command in ['workspace', 'ws'] and not args.workspace_type:
-        parser_workspace.print_help()
+        menus['workspace'].print_help()
     elif args.command in ['simulation', 'sim'] and not args.simulation_type:
-        parser_simulation.print_help()
+        menus['simulation'].print_help()
     elif args.command == 'robot' and 'robot_type' in args and not args.robot_type:
-        parser_robot.print_help()
+        menus['robot'].print_help()
     elif args.command == 'robot' and 'robot_type' in args and args.robot_type == 'config' and not args.config_type:
-        parser_config.print_help()
+        menus['config'].print_help()
     elif args.command == 'swarm' and not args.swarm_type:
-        parser_swarm.print_help()
+        menus['swarm'].print_help()
     elif hasattr(args, 'func'):
         # Execute the corresponding function based on the subcommand
         args.func(platform, params, args)
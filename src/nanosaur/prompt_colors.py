@@ -24,12 +24,29 @@
 # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import os
+import stat
 import logging
+from functools import lru_cache, partial
 
 # Set up the logger
 logger = logging.getLogger(__name__)
 
 
+# Reset code
+RESET = "\033[0m"
+
+
+def _styled(text, prefix=''):
+    return f"{prefix}{text}{RESET}"
+
+
+@lru_cache(maxsize=None)
+def green_theme():
+    """Return the theme of the inquirer prompts, built once and shared by all the prompts."""
+    from inquirer.themes import GreenPassion
+    return GreenPassion()
+
+
 class TerminalFormatter:
     # Define ANSI color codes
     COLORS = {
@@ -59,8 +76,30 @@ class TerminalFormatter:
     BOLD = '1'
     ITALIC = '3'
 
+    # Styles used most, with the escape sequence already built
+    bold = partial(_styled, prefix=f"\033[{BOLD}m")
+    red = partial(_styled, prefix=f"\033[{COLORS['red']}m")
+    green = partial(_styled, prefix=f"\033[{COLORS['green']}m")
+    yellow = partial(_styled, prefix=f"\033[{COLORS['yellow']}m")
+    red_bold = partial(_styled, prefix=f"\033[{COLORS['red']};{BOLD}m")
+    green_bold = partial(_styled, prefix=f"\033[{COLORS['green']};{BOLD}m")
+    yellow_bold = partial(_styled, prefix=f"\033[{COLORS['yellow']};{BOLD}m")
+    magenta_bold = partial(_styled, prefix=f"\033[{COLORS['magenta']};{BOLD}m")
+
+    # Escape sequences already built, by style
+    _PREFIX_CACHE = {}
+
     @staticmethod
     def color_text(text, color=None, bg_color=None, bold=False, italic=False):
+        key = (color, bg_color, bold, italic)
+        style_prefix = TerminalFormatter._PREFIX_CACHE.get(key)
+        if style_prefix is None:
+            style_prefix = TerminalFormatter._PREFIX_CACHE[key] = TerminalFormatter._style_prefix(color, bg_color, bold, italic)
+        # Return the styled text
+        return _styled(text, style_prefix)
+
+    @staticmethod
+    def _style_prefix(color, bg_color, bold, italic):
         # Start with the style codes list
         style_codes = []
 
@@ -79,12 +118,7 @@ class TerminalFormatter:
             style_codes.append(TerminalFormatter.ITALIC)
 
         # Join all the style codes into one sequence
-        style_prefix = f"\033[{';'.join(style_codes)}m" if style_codes else ''
-        # Reset code
-        reset_code = "\033[0m"
-
-        # Return the styled text
-        return f"{style_prefix}{text}{reset_code}"
+        return f"\033[{';'.join(style_codes)}m" if style_codes else ''
 
     @staticmethod
     def clickable_text(text, url):
@@ -106,15 +140,19 @@ class TerminalFormatter:
         :param path: The file path to be used as both the display text and the URL.
         :return: A string formatted as a clickable link.
         """
-        if os.path.isfile(path) or os.path.isdir(path):
-            url = f"file://{os.path.abspath(path)}"
-            return TerminalFormatter.clickable_text(path, url)
-        elif os.path.islink(path):
-            url = f"file://{os.path.abspath(os.readlink(path))}"
-            return TerminalFormatter.clickable_text(path, url)
-        elif path.startswith("http://") or path.startswith("https://"):
+        if path.startswith(("http://", "https://")):
             return TerminalFormatter.clickable_text(path, path)
-        else:
+        # One lstat answers if the path is a file, a folder or a link
+        try:
+            mode = os.lstat(path).st_mode
+        except (OSError, ValueError):
             return path  # Return the same text if it's neither a file, directory, link, nor URL
+        if stat.S_ISLNK(mode):
+            # A link to a file or folder points to the path, a broken link to its target
+            target = path if os.path.exists(path) else os.readlink(path)
+            return TerminalFormatter.clickable_text(path, f"file://{os.path.abspath(target)}")
+        if stat.S_ISREG(mode) or stat.S_ISDIR(mode):
+            return TerminalFormatter.clickable_text(path, f"file://{os.path.abspath(path)}")
+        return path
 
 # EOF
@@ -23,16 +23,13 @@
 # OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
 # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import inquirer
-from inquirer.themes import GreenPassion
 import argparse
 import subprocess
 import shlex
 import logging
 from nanosaur import workspace
-from nanosaur import docker
-from nanosaur.prompt_colors import TerminalFormatter
-from nanosaur.utilities import Params, RobotList, Robot
+from nanosaur.prompt_colors import TerminalFormatter, green_theme
+from nanosaur.utilities import Params, RobotList, Robot, load_ros_env
 from nanosaur.utilities import ENGINES_CHOICES, CAMERA_CHOICES, LIDAR_CHOICES
 
 # Set up the logger
@@ -42,34 +39,34 @@ logger = logging.getLogger(__name__)
 def add_robot_config_subcommands(platform, subparsers: argparse._SubParsersAction, params: Params) -> argparse.ArgumentParser:
     # Get the robot data
     robot_data = RobotList.current_robot(params)
-    robot_name = TerminalFormatter.color_text(robot_data.name, color='green', bold=True)
+    robot_name = TerminalFormatter.green_bold(robot_data.name)
     parser_robot_config = subparsers.add_parser('config', help=f"Configure the robot settings [{robot_name}]")
     config_subparsers = parser_robot_config.add_subparsers(dest='config_type', help="Configuration options")
     # Add robot name subcommand
     parser_robot_name = config_subparsers.add_parser('name', help=f"Set robot name [{robot_name}]")
     parser_robot_name.set_defaults(func=robot_set_name)
     # Add robot domain id subcommand
-    domain_id = TerminalFormatter.color_text(robot_data.domain_id, bold=True)
+    domain_id = TerminalFormatter.bold(robot_data.domain_id)
     parser_robot_domain_id = config_subparsers.add_parser('domain_id', help=f"Set robot domain ID [{domain_id}]")
     parser_robot_domain_id.set_defaults(func=robot_set_domain_id)
     # Add robot simulation subcommand
     device_type = "robot" if platform['Machine'] == 'aarch64' else "desktop"
     if device_type == 'desktop':
-        simulation = TerminalFormatter.color_text('simulation' if robot_data.simulation else 'real', bold=True)
+        simulation = TerminalFormatter.bold('simulation' if robot_data.simulation else 'real')
         parser_robot_simulation = config_subparsers.add_parser('simulation', help=f"Set robot real or simulation [{simulation}]")
         parser_robot_simulation.set_defaults(func=robot_set_simulation)
     # Add robot camera subcommand
-    camera_type = TerminalFormatter.color_text(robot_data.camera_type or 'NOT SELECTED', bold=True)
+    camera_type = TerminalFormatter.bold(robot_data.camera_type or 'NOT SELECTED')
     parser_robot_camera = config_subparsers.add_parser('camera', help=f"Set robot camera type [{camera_type}]")
     parser_robot_camera.add_argument('--new', type=str, help=f"Specify the new camera type (options: {', '.join(CAMERA_CHOICES)})")
     parser_robot_camera.set_defaults(func=robot_set_camera)
     # Add robot lidar subcommand
-    lidar_type = TerminalFormatter.color_text(robot_data.lidar_type or 'NOT SELECTED', bold=True)
+    lidar_type = TerminalFormatter.bold(robot_data.lidar_type or 'NOT SELECTED')
     parser_robot_lidar = config_subparsers.add_parser('lidar', help=f"Set robot lidar type [{lidar_type}]")
     parser_robot_lidar.add_argument('--new', type=str, choices=LIDAR_CHOICES, help=f"Specify the new lidar type (options: {', '.join(LIDAR_CHOICES)})")
     parser_robot_lidar.set_defaults(func=robot_set_lidar)
     # Add robot engines subcommand
-    engines = TerminalFormatter.color_text(', '.join(robot_data.engines) if robot_data.engines else 'NO ENGINES', bold=True)
+    engines = TerminalFormatter.bold(', '.join(robot_data.engines) if robot_data.engines else 'NO ENGINES')
     engines_help = f"Configure robot engines [{engines}]"
     parser_robot_engines = config_subparsers.add_parser('engines', help=engines_help)
     parser_robot_engines.add_argument('--new', type=str, help="Specify the new engine configuration")
@@ -81,11 +78,14 @@ def add_robot_config_subcommands(platform, subparsers: argparse._SubParsersActio
     return parser_robot_config
 
 
-def parser_robot_menu(platform, subparsers: argparse._SubParsersAction, params: Params) -> argparse.ArgumentParser:
+def parser_robot_menu(platform, subparsers: argparse._SubParsersAction, params: Params, stub=False) -> argparse.ArgumentParser:
     try:
         robot_data = RobotList.current_robot(params)
-        robot_name = TerminalFormatter.color_text(robot_data.name, color='green', bold=True)
+        robot_name = TerminalFormatter.green_bold(robot_data.name)
         parser_robot = subparsers.add_parser('robot', help=f"Manage the Nanosaur robot [{robot_name}]")
+        # Only the command, the robot operations are added when selected
+        if stub:
+            return parser_robot, None
         robot_subparsers = parser_robot.add_subparsers(dest='robot_type', help="Robot operations")
 
         # Add robot start subcommand
@@ -94,10 +94,10 @@ def parser_robot_menu(platform, subparsers: argparse._SubParsersAction, params:
             '--profile', type=str, help="Specify the profile name to use")
         parser_robot_start.add_argument(
             '--detach', action='store_true', help="Run the robot in detached mode")
-        parser_robot_start.set_defaults(func=docker.docker_robot_start)
+        parser_robot_start.set_defaults(func=robot_start)
         # Add robot stop subcommand
         parser_robot_stop = robot_subparsers.add_parser('stop', help="Deactivate the robot")
-        parser_robot_stop.set_defaults(func=docker.docker_robot_stop)
+        parser_robot_stop.set_defaults(func=robot_stop)
         # Add robot display subcommand
         parser_robot_display = robot_subparsers.add_parser('rviz', help="Show the robot on rviz")
         parser_robot_display.set_defaults(func=robot_display)
@@ -129,12 +129,15 @@ def wizard(platform, params: Params, args):
     # Add a new robot
     robot = Robot()
     robot.simulation = device_type == 'desktop'
-    RobotList.add_robot(params, robot, save=False)
-    return all(func(platform, params, args) for func in functions_list)
+    # The new robot is saved once, when all the settings are asked
+    with params.batch():
+        RobotList.add_robot(params, robot, save=False)
+        return all(func(platform, params, args) for func in functions_list)
 
 
 def robot_set_name(platform, params: Params, args):
     """Configure the robot name."""
+    import inquirer
     robot = RobotList.current_robot(params)
 
     def validate_name(_, x):
@@ -151,24 +154,25 @@ def robot_set_name(platform, params: Params, args):
         )
     ]
 
-    answers = inquirer.prompt(question, theme=GreenPassion())
+    answers = inquirer.prompt(question, theme=green_theme())
     if answers is None:
         return False
     if not answers['name']:
-        print(TerminalFormatter.color_text("No name provided", color='red'))
+        print(TerminalFormatter.red("No name provided"))
         return False
     new_name = answers['name']
     if new_name != robot.name:
         robot.name = new_name
         RobotList.update_robot(params, robot)
-        logger.debug(TerminalFormatter.color_text(f"Robot name set to: {robot.name}", color='green'))
+        logger.debug(TerminalFormatter.green(f"Robot name set to: {robot.name}"))
     else:
-        logger.debug(TerminalFormatter.color_text(f"Robot name {new_name} is already set", color='yellow'))
+        logger.debug(TerminalFormatter.yellow(f"Robot name {new_name} is already set"))
     return True
 
 
 def robot_set_domain_id(platform, params: Params, args):
     """Configure the domain ID."""
+    import inquirer
     robot = RobotList.current_robot(params)
 
     def validate_domain_id(_, x):
@@ -185,21 +189,22 @@ def robot_set_domain_id(platform, params: Params, args):
         )
     ]
 
-    answers = inquirer.prompt(question, theme=GreenPassion())
+    answers = inquirer.prompt(question, theme=green_theme())
     if answers is None:
         return False
     new_domain_id = int(answers['domain_id'])
     if new_domain_id != robot.domain_id:
         robot.domain_id = new_domain_id
         RobotList.update_robot(params, robot)
-        logger.debug(TerminalFormatter.color_text(f"Domain ID set to: {robot.domain_id}", color='green'))
+        logger.debug(TerminalFormatter.green(f"Domain ID set to: {robot.domain_id}"))
     else:
-        logger.debug(TerminalFormatter.color_text(f"Domain ID {new_domain_id} is already set", color='yellow'))
+        logger.debug(TerminalFormatter.yellow(f"Domain ID {new_domain_id} is already set"))
     return True
 
 
 def robot_set_simulation(platform, params: Params, args):
     """Configure the robot if is real or a simulation."""
+    import inquirer
     robot = RobotList.current_robot(params)
 
     question = [
@@ -211,18 +216,19 @@ def robot_set_simulation(platform, params: Params, args):
         )
     ]
 
-    answers = inquirer.prompt(question, theme=GreenPassion())
+    answers = inquirer.prompt(question, theme=green_theme())
     if answers is None:
         return False
     is_simulation = answers['simulation'] == 'simulation'
     robot.simulation = is_simulation
     RobotList.update_robot(params, robot)
-    logger.debug(TerminalFormatter.color_text(f"Simulator set to: {answers['simulation']}", color='green'))
+    logger.debug(TerminalFormatter.green(f"Simulator set to: {answers['simulation']}"))
     return True
 
 
 def robot_set_camera(platform, params: Params, args):
     """Configure the camera."""
+    import inquirer
     robot = RobotList.current_robot(params)
 
     all_cameras = sorted(set(CAMERA_CHOICES + [robot.camera_type]))
@@ -231,9 +237,9 @@ def robot_set_camera(platform, params: Params, args):
         if args.new not in all_cameras:
             robot.camera_type = args.new
             RobotList.update_robot(params, robot)
-            print(TerminalFormatter.color_text(f"New camera {args.new} selected", color='green'))
+            print(TerminalFormatter.green(f"New camera {args.new} selected"))
         else:
-            print(TerminalFormatter.color_text(f"Camera {args.new} is already exist", color='yellow'))
+            print(TerminalFormatter.yellow(f"Camera {args.new} is already exist"))
         return True
 
     options = [
@@ -245,7 +251,7 @@ def robot_set_camera(platform, params: Params, args):
         )
     ]
 
-    answers = inquirer.prompt(options, theme=GreenPassion())
+    answers = inquirer.prompt(options, theme=green_theme())
     if answers is None:
         return False
     selected_camera = answers['camera'].replace(" (selected)", "")
@@ -254,14 +260,15 @@ def robot_set_camera(platform, params: Params, args):
     if selected_camera != robot.camera_type:
         robot.camera_type = selected_camera
         RobotList.update_robot(params, robot)
-        logger.debug(TerminalFormatter.color_text(f"Camera set to: {robot.camera_type or 'No camera'}", color='green'))
+        logger.debug(TerminalFormatter.green(f"Camera set to: {robot.camera_type or 'No camera'}"))
     else:
-        logger.debug(TerminalFormatter.color_text(f"Camera {selected_camera or 'No camera'} is already selected", color='yellow'))
+        logger.debug(TerminalFormatter.yellow(f"Camera {selected_camera or 'No camera'} is already selected"))
     return True
 
 
 def robot_set_lidar(platform, params: Params, args):
     """Configure the lidar."""
+    import inquirer
     robot = RobotList.current_robot(params)
 
     all_lidars = sorted(set(LIDAR_CHOICES + [robot.lidar_type]))
@@ -270,9 +277,9 @@ def robot_set_lidar(platform, params: Params, args):
         if args.new not in all_lidars:
             robot.lidar_type = args.new
             RobotList.update_robot(params, robot)
-            logger.debug(TerminalFormatter.color_text(f"New lidar {args.new} selected", color='green'))
+            logger.debug(TerminalFormatter.green(f"New lidar {args.new} selected"))
         else:
-            logger.debug(TerminalFormatter.color_text(f"Lidar {args.new} is already exist", color='yellow'))
+            logger.debug(TerminalFormatter.yellow(f"Lidar {args.new} is already exist"))
         return True
 
     options = [
@@ -284,7 +291,7 @@ def robot_set_lidar(platform, params: Params, args):
         )
     ]
 
-    answers = inquirer.prompt(options, theme=GreenPassion())
+    answers = inquirer.prompt(options, theme=green_theme())
     if answers is None:
         return False
     selected_lidar = answers['lidar'].replace(" (selected)", "")
@@ -293,23 +300,24 @@ def robot_set_lidar(platform, params: Params, args):
     if selected_lidar != robot.lidar_type:
         robot.lidar_type = selected_lidar
         RobotList.update_robot(params, robot)
-        logger.debug(TerminalFormatter.color_text(f"Lidar set to: {robot.lidar_type or 'No lidar'}", color='green'))
+        logger.debug(TerminalFormatter.green(f"Lidar set to: {robot.lidar_type or 'No lidar'}"))
     else:
-        logger.debug(TerminalFormatter.color_text(f"Lidar {selected_lidar or 'No lidar'} is already selected", color='yellow'))
+        logger.debug(TerminalFormatter.yellow(f"Lidar {selected_lidar or 'No lidar'} is already selected"))
     return True
 
 
 def robot_configure_engines(platform, params: Params, args):
     """Configure the robot engines."""
+    import inquirer
     robot = RobotList.current_robot(params)
 
     if args.new is not None:
         if args.new not in robot.engines:
             robot.engines.append(args.new)
             RobotList.update_robot(params, robot)
-            print(TerminalFormatter.color_text(f"New engine {args.new} added", color='green'))
+            print(TerminalFormatter.green(f"New engine {args.new} added"))
         else:
-            print(TerminalFormatter.color_text(f"Engine {args.new} is already enabled", color='yellow'))
+            print(TerminalFormatter.yellow(f"Engine {args.new} is already enabled"))
         return True
 
     engine_choices = [
@@ -321,15 +329,15 @@ def robot_configure_engines(platform, params: Params, args):
         )
     ]
 
-    answers = inquirer.prompt(engine_choices, theme=GreenPassion())
+    answers = inquirer.prompt(engine_choices, theme=green_theme())
     if answers is None:
         return False
     robot.engines = answers['engines']
     RobotList.update_robot(params, robot)
     if robot.engines:
-        logger.debug(TerminalFormatter.color_text(f"Engines updated: {', '.join(robot.engines)}", color='green'))
+        logger.debug(TerminalFormatter.green(f"Engines updated: {', '.join(robot.engines)}"))
     else:
-        logger.debug(TerminalFormatter.color_text("No engines selected", color='yellow'))
+        logger.debug(TerminalFormatter.yellow("No engines selected"))
     return True
 
 
@@ -337,16 +345,44 @@ def robot_reset(platform, params: Params, args):
     """Reset the robot configuration."""
     # Reset the robot configuration
     RobotList.remove_robot(params)
-    print(TerminalFormatter.color_text("Robot configuration reset", color='green'))
+    print(TerminalFormatter.green("Robot configuration reset"))
     return True
 
 
+def robot_start(platform, params: Params, args):
+    """Start the robot containers."""
+    from nanosaur.docker import docker_robot_start
+    return docker_robot_start(platform, params, args)
+
+
+def robot_stop(platform, params: Params, args):
+    """Stop the robot containers."""
+    from nanosaur.docker import docker_robot_stop
+    return docker_robot_stop(platform, params, args)
+
+
+def _robot_ros_env(params: Params, robot: Robot):
+    """Return the simulation workspace environment on the robot domain, None if the workspace is not built."""
+    nanosaur_ws_path = workspace.get_workspace_path(params, 'ws_simulation_name')
+    try:
+        env = load_ros_env(f'{nanosaur_ws_path}/install/setup.bash') if nanosaur_ws_path else None
+    except subprocess.CalledProcessError:
+        # The setup file exists but fails to source
+        env = None
+    if env is None:
+        print(TerminalFormatter.red("Workspace not built. Build before to debug"))
+        return None
+    env['ROS_DOMAIN_ID'] = str(robot.domain_id)
+    return env
+
+
 def control_terminal(platform, params: Params, args):
     """Control the robot using the terminal."""
+    from nanosaur import docker
     # Get the robot
     robot = RobotList.current_robot(params)
     if robot.simulation and 'simulation' not in params:
-        print(TerminalFormatter.color_text("No simulation tool selected. Please run 'nanosaur simulation set' first.", color='red'))
+        print(TerminalFormatter.red("No simulation tool selected. Please run 'nanosaur simulation set' first."))
         return False
     # Run from docker container
     docker.docker_service_run_command(platform, params, "diagnostic", ["bash"], name=f"{robot.name}-terminal")
@@ -355,10 +391,11 @@ def control_terminal(platform, params: Params, args):
 
 def control_keyboard(platform, params: Params, args):
     """Control the robot using the keyboard."""
+    from nanosaur import docker
     # Get the robot
     robot = RobotList.current_robot(params)
     if robot.simulation and 'simulation' not in params:
-        print(TerminalFormatter.color_text("No simulation tool selected. Please run 'nanosaur simulation set' first.", color='red'))
+        print(TerminalFormatter.red("No simulation tool selected. Please run 'nanosaur simulation set' first."))
         return False
     # Get location starting function (host or docker)
     selected_location = workspace.get_starting_location(params)
@@ -368,23 +405,25 @@ def control_keyboard(platform, params: Params, args):
     command = f"ros2 run teleop_twist_keyboard teleop_twist_keyboard --ros-args --remap /cmd_vel:=/{robot.name}/key_vel"
     # Run from local machine
     if selected_location == 'host':
-        nanosaur_ws_path = workspace.get_workspace_path(params, 'ws_simulation_name')
-        bash_file = f'{nanosaur_ws_path}/install/setup.bash'
+        env = _robot_ros_env(params, robot)
+        if env is None:
+            return False
         # Read the robot name
-        print(TerminalFormatter.color_text(f"Control the robot {robot.name} using the keyboard", color='green'))
-        subprocess.run(f'source {bash_file} && {command}', shell=True, executable='/bin/bash')
+        print(TerminalFormatter.green(f"Control the robot {robot.name} using the keyboard"))
+        subprocess.run(shlex.split(command), env=env, close_fds=False)
         return True
     elif selected_location == 'docker':
         # Run from docker container
         docker.docker_service_run_command(platform, params, "diagnostic", shlex.split(command), name=f"{robot.name}-keyboard")
         return True
     else:
-        print(TerminalFormatter.color_text(f"Unknown debug mode: {selected_location}", color='red'))
+        print(TerminalFormatter.red(f"Unknown debug mode: {selected_location}"))
         return False
 
 
 def robot_display(platform, params: Params, args):
     """Display the robot configuration."""
+    from nanosaur import docker
     # Get location starting function (host or docker)
     selected_location = workspace.get_starting_location(params)
     if selected_location is None:
@@ -394,19 +433,20 @@ def robot_display(platform, params: Params, args):
     command = f"ros2 launch nanosaur_visualization robot_display.launch.py robot_name:={robot.name}"
     # Run from local machine
     if selected_location == 'host':
-        nanosaur_ws_path = workspace.get_workspace_path(params, 'ws_simulation_name')
-        bash_file = f'{nanosaur_ws_path}/install/setup.bash'
-        print(TerminalFormatter.color_text(f"Display the robot {robot.name}", color='green'))
+        env = _robot_ros_env(params, robot)
+        if env is None:
+            return False
+        print(TerminalFormatter.green(f"Display the robot {robot.name}"))
         try:
-            subprocess.run(f'source {bash_file} && {command}', shell=True, executable='/bin/bash')
+            subprocess.run(shlex.split(command), env=env, close_fds=False)
         except KeyboardInterrupt:
-            print(TerminalFormatter.color_text("Keyboard interrupt received, stopping robot display", color='yellow'))
+            print(TerminalFormatter.yellow("Keyboard interrupt received, stopping robot display"))
         return True
     elif selected_location == 'docker':
         # Run from docker container
         docker.docker_service_run_command(platform, params, "diagnostic", shlex.split(command), name=f"{robot.name}-rviz")
         return True
     else:
-        print(TerminalFormatter.color_text(f"Unknown debug mode: {selected_location}", color='red'))
+        print(TerminalFormatter.red(f"Unknown debug mode: {selected_location}"))
         return False
 # EOF
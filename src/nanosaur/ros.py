@@ -35,10 +35,8 @@ import shutil
 import logging
 import yaml
 import urllib.parse
-from python_on_whales import docker, DockerException
 from nanosaur.prompt_colors import TerminalFormatter
-from nanosaur.utilities import get_nanosaur_home, Robot
-from git import Repo, GitCommandError
+from nanosaur.utilities import get_nanosaur_home, Robot, stream_process, YAML_LOADER
 
 # Set up the logger
 logger = logging.getLogger(__name__)
@@ -54,6 +52,7 @@ def get_ros2_path(version, folder="/opt/ros"):
 
 
 def run_docker_ros(docker_image):
+    from python_on_whales import docker
 
     docker.run(docker_image, command="bash")
 
@@ -76,7 +75,7 @@ def run_docker_isaac_ros(workspace_path: str, robot: Robot, auto_commands=[]):
     config_path = os.path.join(isaac_ros_common_path, 'scripts', '.isaac_ros_common-config')
     if os.path.exists(config_path):
         os.remove(config_path)
-        logger.debug(TerminalFormatter.color_text(f"Removed existing config file: {config_path}", color='yellow'))
+        logger.debug(TerminalFormatter.yellow(f"Removed existing config file: {config_path}"))
 
     # Save the original terminal settings
     original_termios = termios.tcgetattr(sys.stdin)
@@ -148,17 +147,18 @@ def run_docker_isaac_ros(workspace_path: str, robot: Robot, auto_commands=[]):
         restore_terminal()  # Restore the original terminal settings
         os.close(master_fd)
 
-    print(TerminalFormatter.color_text("Dev script finished", color='green'))
+    print(TerminalFormatter.green("Dev script finished"))
 
 
 def rosinstall_reader(workspace_path, rosinstall_path, src_folder="src", tag_version=None, token=None) -> bool:
+    from git import Repo, GitCommandError
     folder_path = os.path.join(workspace_path, src_folder)
     if not os.path.exists(folder_path):
-        print(TerminalFormatter.color_text(f"Error: Folder {folder_path} does not exist.", color='red'))
+        print(TerminalFormatter.red(f"Error: Folder {folder_path} does not exist."))
         return False
     # Load the YAML file
     with open(rosinstall_path, 'r') as file:
-        repos = yaml.safe_load(file)
+        repos = yaml.load(file, Loader=YAML_LOADER)
     # Iterate over the repositories in the YAML file
     for repo in repos:
         if git_info := repo.get('git'):
@@ -167,7 +167,7 @@ def rosinstall_reader(workspace_path, rosinstall_path, src_folder="src", tag_ver
             version = git_info.get('version', 'main')  # Default to 'main' if no version is provided
             if tag_version:
                 version = tag_version
-                print(TerminalFormatter.color_text(f"Warning: Overriding tag version with {tag_version}", color='yellow'))
+                print(TerminalFormatter.yellow(f"Warning: Overriding tag version with {tag_version}"))
             uri = git_info.get('uri')
 
             # Ensure that local_name is always defined
@@ -182,7 +182,7 @@ def rosinstall_reader(workspace_path, rosinstall_path, src_folder="src", tag_ver
             print(f"Cloning {repo_path}...")
             new_uri = uri
             if token is not None:
-                print(TerminalFormatter.color_text("Using token for authentication", color='yellow'))
+                print(TerminalFormatter.yellow("Using token for authentication"))
                 new_uri = uri.replace("https://", f"https://{token['username']}:{token['password']}@", 1)
             # Clone the repository
             repo_dir = Repo.clone_from(new_uri, repo_path, branch=version)
@@ -195,7 +195,7 @@ def rosinstall_reader(workspace_path, rosinstall_path, src_folder="src", tag_ver
                 repo_dir = Repo(repo_path)
                 original_remote_url = repo_dir.remotes.origin.url
                 if token is not None:
-                    print(TerminalFormatter.color_text("Using token for authentication", color='yellow'))
+                    print(TerminalFormatter.yellow("Using token for authentication"))
                     authenticated_remote_url = original_remote_url.replace("https://", f"https://{token['username']}:{token['password']}@", 1)
                 else:
                     authenticated_remote_url = original_remote_url
@@ -207,7 +207,7 @@ def rosinstall_reader(workspace_path, rosinstall_path, src_folder="src", tag_ver
                 if modified_files := repo_dir.git.diff('--name-only'):
                     print(f"\nAlready on '{version}'")
                     for file in modified_files.splitlines():
-                        print(TerminalFormatter.color_text(f"M\t{file}", color='yellow'))
+                        print(TerminalFormatter.yellow(f"M\t{file}"))
                 if token is not None:
                     # Remove the token from the URL
                     repo_dir.remotes.origin.set_url(original_remote_url)
@@ -231,25 +231,18 @@ def run_vcs_import(workspace_path, rosinstall_path, src_folder="src") -> bool:
             f"vcs import {workspace_path}/{src_folder} < {rosinstall_path}",
             shell=True,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stderr=subprocess.PIPE,
+            close_fds=False
         )
 
-        # Stream output live
-        for line in process.stdout:
-            print(line.decode('utf-8'), end="")  # Print stdout line-by-line
-
-        # Wait for the process to finish
-        process.wait()
-
-        # Stream any errors
-        for line in process.stderr:
-            print(TerminalFormatter.color_text(line.decode('utf-8'), color='red'), end="")  # Print stderr (errors) in red
+        # Stream stdout and stderr (in red) live, then wait for the process to finish
+        stream_process(process)
 
         # Check the exit status of the command
         if process.returncode != 0:
-            print(TerminalFormatter.color_text(process.returncode, color='red'))
+            print(TerminalFormatter.red(process.returncode))
         else:
-            print(TerminalFormatter.color_text("Command completed successfully", color='green'))
+            print(TerminalFormatter.green("Command completed successfully"))
 
         return process.returncode == 0
 
@@ -268,25 +261,18 @@ def run_rosdep(ros2_path, folder_path, shared_src_path) -> bool:
             executable="/bin/bash",
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
+            close_fds=False,
         )
 
-        # Stream output live
-        for line in process.stdout:
-            print(line.decode('utf-8'), end="")  # Print stdout line-by-line
-
-        # Wait for the process to finish
-        process.wait()
-
-        # Stream any errors
-        for line in process.stderr:
-            print(TerminalFormatter.color_text(line.decode('utf-8'), color='red'), end="")  # Print stderr (errors) in red
+        # Stream stdout and stderr (in red) live, then wait for the process to finish
+        stream_process(process)
 
         # Check the exit status of the command
         if process.returncode != 0:
-            print(TerminalFormatter.color_text(process.returncode, color='red'))
+            print(TerminalFormatter.red(process.returncode))
             return False
         else:
-            print(TerminalFormatter.color_text("Command completed successfully", color='green'))
+            print(TerminalFormatter.green("Command completed successfully"))
             return True
 
     except Exception as e:
@@ -308,24 +294,17 @@ def run_colcon_build(ros2_path, folder_path) -> bool:
             executable="/bin/bash",
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
+            close_fds=False,
         )
 
-        # Stream output live
-        for line in process.stdout:
-            print(line.decode('utf-8'), end="")  # Print stdout line-by-line
-
-        # Wait for the process to finish
-        process.wait()
-
-        # Stream any errors
-        for line in process.stderr:
-            print(TerminalFormatter.color_text(line.decode('utf-8'), color='red'), end="")  # Print stderr (errors) in red
+        # Stream stdout and stderr (in red) live, then wait for the process to finish
+        stream_process(process)
 
         # Check the exit status of the command
         if process.returncode != 0:
-            print(TerminalFormatter.color_text(process.returncode, color='red'))
+            print(TerminalFormatter.red(process.returncode))
         else:
-            print(TerminalFormatter.color_text("Command completed successfully", color='green'))
+            print(TerminalFormatter.green("Command completed successfully"))
 
         return process.returncode == 0
 
@@ -335,14 +314,15 @@ def run_colcon_build(ros2_path, folder_path) -> bool:
 
 
 def deploy_docker_image(dockerfile_path, tag_image, platforms=None, push=False, release=None) -> bool:
+    from python_on_whales import docker, DockerException
     try:
-        print(TerminalFormatter.color_text(f"Building Docker image {tag_image}", color='magenta', bold=True))
+        print(TerminalFormatter.magenta_bold(f"Building Docker image {tag_image}"))
         if release:
-            print(TerminalFormatter.color_text(f"- for release: {tag_image}-{release}", color='magenta', bold=True))
+            print(TerminalFormatter.magenta_bold(f"- for release: {tag_image}-{release}"))
         if platforms:
-            print(TerminalFormatter.color_text(f"- for platforms: {platforms}", color='magenta', bold=True))
+            print(TerminalFormatter.magenta_bold(f"- for platforms: {platforms}"))
         if push:
-            print(TerminalFormatter.color_text("- and pushing to the registry", color='magenta', bold=True))
+            print(TerminalFormatter.magenta_bold("- and pushing to the registry"))
         docker.build(
             get_nanosaur_home(),
             file=dockerfile_path,
@@ -350,10 +330,10 @@ def deploy_docker_image(dockerfile_path, tag_image, platforms=None, push=False,
             platforms=platforms,
             push=push,   # Required for multi-platform builds
         )
-        print(TerminalFormatter.color_text("Docker image built successfully", color='green'))
+        print(TerminalFormatter.green("Docker image built successfully"))
         return True
     except DockerException as e:
-        print(TerminalFormatter.color_text(f"Error building Docker image: {e}", color='red'))
+        print(TerminalFormatter.red(f"Error building Docker image: {e}"))
         return False
 
 
@@ -370,12 +350,13 @@ def deploy_docker_isaac_ros(isaac_ros_ws_path, tags, release_tag_name, push=Fals
     Returns:
         bool: True if the deployment is successful, False otherwise.
     """
+    from python_on_whales import docker, DockerException
     # Define shared source path
     shared_path = os.path.join(get_nanosaur_home(), 'shared_src')
     src_path = os.path.join(isaac_ros_ws_path, 'src')
     # Check if src_path is not empty
     if not os.listdir(src_path):
-        print(TerminalFormatter.color_text(f"Error: Source path {isaac_ros_ws_path} is empty.", color='red'))
+        print(TerminalFormatter.red(f"Error: Source path {isaac_ros_ws_path} is empty."))
         return False
     # List of source folders to include in the workspace
     src_folders = [
@@ -393,11 +374,11 @@ def deploy_docker_isaac_ros(isaac_ros_ws_path, tags, release_tag_name, push=Fals
     command = f"{nanosaur_docker_path}/docker_build_isaac_ros.sh {debug_flag} -d {tags_name} -c {isaac_ros_common_path} -i {release_tag_name} {ws_dir_list}"
 
     try:
-        print(TerminalFormatter.color_text(f"Deploying {release_tag_name}", color='magenta', bold=True))
+        print(TerminalFormatter.magenta_bold(f"Deploying {release_tag_name}"))
         if release:
-            print(TerminalFormatter.color_text(f"- for release: {release_tag_name}-{release}", color='magenta', bold=True))
+            print(TerminalFormatter.magenta_bold(f"- for release: {release_tag_name}-{release}"))
         if push:
-            print(TerminalFormatter.color_text("- and pushing to the registry", color='magenta', bold=True))
+            print(TerminalFormatter.magenta_bold("- and pushing to the registry"))
         # Run the command and stream the output live
         process = subprocess.Popen(
             command,
@@ -405,20 +386,18 @@ def deploy_docker_isaac_ros(isaac_ros_ws_path, tags, release_tag_name, push=Fals
             executable="/bin/bash",
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
+            close_fds=False,
         )
-        # Stream output live
-        for line in process.stdout:
-            print(line.decode('utf-8', errors='replace'), end="")
-        # Wait for the process to finish
-        process.wait()
+        # Stream output live, then wait for the process to finish
+        stream_process(process)
         # Check the exit status of the command
         if process.returncode != 0:
-            print(TerminalFormatter.color_text(f"Command failed with return code: {process.returncode}", color='red'))
+            print(TerminalFormatter.red(f"Command failed with return code: {process.returncode}"))
             return False
         else:
-            print(TerminalFormatter.color_text("Command completed successfully", color='green'))
+            print(TerminalFormatter.green("Command completed successfully"))
     except KeyboardInterrupt:
-        print(TerminalFormatter.color_text("Process interrupted by user", color='red'))
+        print(TerminalFormatter.red("Process interrupted by user"))
         process.terminate()
         process.wait()
         return False
@@ -427,59 +406,60 @@ def deploy_docker_isaac_ros(isaac_ros_ws_path, tags, release_tag_name, push=Fals
         return False
 
     if release:
-        print(TerminalFormatter.color_text(f"Tagging Docker image with release version: {release_tag_name}-{release}", color='magenta', bold=True))
+        print(TerminalFormatter.magenta_bold(f"Tagging Docker image with release version: {release_tag_name}-{release}"))
         # Tag the image with the release version
         docker.tag(release_tag_name, f"{release_tag_name}-{release}")
 
     if push:
         try:
             # Push the Docker image to the registry
-            print(TerminalFormatter.color_text(f"Pushing Docker image {release_tag_name}", color='magenta', bold=True))
+            print(TerminalFormatter.magenta_bold(f"Pushing Docker image {release_tag_name}"))
             docker.push(release_tag_name)
             if release:
-                print(TerminalFormatter.color_text(f"Pushing docker image: {release_tag_name}-{release}", color='magenta', bold=True))
+                print(TerminalFormatter.magenta_bold(f"Pushing docker image: {release_tag_name}-{release}"))
                 docker.push(f"{release_tag_name}-{release}")
-            print(TerminalFormatter.color_text("Docker image pushed successfully", color='green'))
+            print(TerminalFormatter.green("Docker image pushed successfully"))
         except DockerException as e:
-            print(TerminalFormatter.color_text(f"Error pushing Docker image: {e}", color='red'))
+            print(TerminalFormatter.red(f"Error pushing Docker image: {e}"))
             return False
         except KeyboardInterrupt:
-            print(TerminalFormatter.color_text("Process interrupted by user", color='red'))
+            print(TerminalFormatter.red("Process interrupted by user"))
             return False
 
     return True
 
 
 def manage_isaac_ros_common_repo(nanosaur_home_path: str, isaac_ros_branch: str, force) -> bool:
+    from git import Repo, GitCommandError
     # Path to the Isaac ROS common package
     isaac_ros_common_path = os.path.join(nanosaur_home_path, ISAAC_ROS_COMMON_FOLDER)
 
     def update_existing_repo():
         try:
-            print(TerminalFormatter.color_text(f"Directory '{isaac_ros_common_path}' already exists. Pulling latest changes from branch '{isaac_ros_branch}'.", color='yellow'))
+            print(TerminalFormatter.yellow(f"Directory '{isaac_ros_common_path}' already exists. Pulling latest changes from branch '{isaac_ros_branch}'."))
             repo = Repo(isaac_ros_common_path)
             repo.git.checkout(isaac_ros_branch)
             repo.remotes.origin.pull()
-            print(TerminalFormatter.color_text("Repository updated successfully", color='green'))
+            print(TerminalFormatter.green("Repository updated successfully"))
             return True
         except GitCommandError as e:
-            print(TerminalFormatter.color_text(f"Error updating repository: {e}", color='red'))
+            print(TerminalFormatter.red(f"Error updating repository: {e}"))
             return False
 
     def clone_new_repo():
         try:
-            print(TerminalFormatter.color_text(f"Cloning isaac_ros_common into '{isaac_ros_common_path}' from branch '{isaac_ros_branch}'", color='magenta', bold=True))
+            print(TerminalFormatter.magenta_bold(f"Cloning isaac_ros_common into '{isaac_ros_common_path}' from branch '{isaac_ros_branch}'"))
             Repo.clone_from(ISAAC_ROS_COMMON_REPO, isaac_ros_common_path, branch=isaac_ros_branch)
-            print(TerminalFormatter.color_text("Clone completed successfully", color='green'))
+            print(TerminalFormatter.green("Clone completed successfully"))
             return True
         except GitCommandError as e:
-            print(TerminalFormatter.color_text(f"Error cloning repository from branch '{isaac_ros_branch}': {e}", color='red'))
+            print(TerminalFormatter.red(f"Error cloning repository from branch '{isaac_ros_branch}': {e}"))
             return False
 
     # Check if the Isaac ROS common package already exists
     if os.path.exists(isaac_ros_common_path):
         if force:
-            print(TerminalFormatter.color_text(f"Deleting existing directory '{isaac_ros_common_path}'.", color='yellow'))
+            print(TerminalFormatter.yellow(f"Deleting existing directory '{isaac_ros_common_path}'."))
             shutil.rmtree(isaac_ros_common_path)
         return update_existing_repo()
     else:
@@ -26,18 +26,21 @@
 import re
 import os
 import shutil
-import inquirer
-from inquirer.themes import GreenPassion
+import shlex
+import signal
+import functools
+import contextlib
 import argparse
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import nanosaur.variables as nsv
 from nanosaur.ros import get_ros2_path
 from nanosaur import workspace
-from nanosaur.docker import docker_simulator_start
-from nanosaur.prompt_colors import TerminalFormatter
-from nanosaur.utilities import Params, RobotList, simulation_build_options
-from packaging.version import parse  # type: ignore
+from nanosaur.prompt_colors import TerminalFormatter, green_theme
+from nanosaur.utilities import Params, RobotList, simulation_build_options, stream_process, load_ros_env
 import operator
 
 # Set up the logger
@@ -55,18 +58,51 @@ MAP_OPERATOR_VERSION = {
 }
 
 # Regex to separate operator and version
-PATTERN_VERSION = re.compile(r'(>=|<=|>|<|==|!=)\s*([\d\.]+)')
+PATTERN_VERSION = re.compile(r'(>=|<=|>|<|==|!=)\s*([\d.]+)', re.ASCII)
 
 # Dictionary of simulation tools and their commands
 simulation_tools = {
-    "isaac-sim": "ros2 launch nanosaur_isaac-sim isaac_sim.launch.py",
-    "gazebo": "ros2 launch nanosaur_gazebo gazebo.launch.py",
+    "isaac-sim": ["ros2", "launch", "nanosaur_isaac-sim", "isaac_sim.launch.py"],
+    "gazebo": ["ros2", "launch", "nanosaur_gazebo", "gazebo.launch.py"],
 }
+# Menu names of the simulation tools
+SIMULATION_TOOL_CHOICES = tuple(tool.capitalize() for tool in simulation_tools)
 
 SIMULATION_WORLD_CHOICES = ['empty', 'lab', 'office', 'warehouse']
-
-
-def parser_simulation_menu(subparsers: argparse._SubParsersAction, params: Params) -> argparse.ArgumentParser:
+# Fixed menus of the simulation settings
+SIMULATION_LOCATION_CHOICES = ('docker', 'host')
+HEADLESS_CHOICES = ('Yes', 'No')
+
+# Styled labels of the simulation info
+_SIMULATION_LABEL = TerminalFormatter.bold("Simulation:")
+_SELECTED_LABEL = TerminalFormatter.bold('   selected:')
+_WORLD_LABEL = TerminalFormatter.bold('   World:')
+_HEADLESS_LABEL = TerminalFormatter.bold('   Headless mode:')
+_LIVESTREAM_LABEL = TerminalFormatter.bold('   Livestream:')
+_HEADLESS_ENABLED = TerminalFormatter.green('enabled')
+_HEADLESS_DISABLED = TerminalFormatter.red('disabled')
+_NO_SIMULATION_TOOLS = TerminalFormatter.red("No simulation tools installed")
+
+# Lines printed by the simulators when they are ready to receive the robot
+SIMULATION_READY = re.compile(rb"Simulation is ready|Simulator ready|Simulation App Startup Complete")
+# Bytes kept from the previous output chunk, longer than any ready line
+SIMULATION_READY_TAIL = 64
+# Launches running on the host, stopped together on Ctrl-C
+_RUNNING_LAUNCHES = set()
+_LAUNCH_LOCK = threading.Lock()
+# Set when the launches are stopped, no new launch is started
+_STOPPING = threading.Event()
+
+# Files of a valid Isaac Sim installation
+ISAAC_SIM_FILES = frozenset(["VERSION", "isaac-sim.sh", "python.sh"])
+# Paths where Isaac Sim is usually installed, with the prefix of the folders to check
+ISAAC_SIM_BASE_PATHS = (
+    (os.path.expanduser("~/.local/share/ov/pkg"), ""),
+    (os.path.expanduser("~"), "isaac"),
+)
+
+
+def parser_simulation_menu(subparsers: argparse._SubParsersAction, params: Params, stub=False) -> argparse.ArgumentParser:
     # Get the simulation data from the parameters
     simulation_data = params.get('simulation', {})
     # Get the simulation tool from the parameters
@@ -74,6 +110,9 @@ def parser_simulation_menu(subparsers: argparse._SubParsersAction, params: Param
     # Add simulation subcommand
     parser_simulation = subparsers.add_parser(
         'simulation', aliases=["sim"], help=f"Work with simulation tools [{simulation_type}]")
+    # Only the command, the simulation operations are added when selected
+    if stub:
+        return parser_simulation
     simulation_subparsers = parser_simulation.add_subparsers(
         dest='simulation_type', help="Simulation types")
 
@@ -82,6 +121,8 @@ def parser_simulation_menu(subparsers: argparse._SubParsersAction, params: Param
         'start', help="Start the selected simulation")
     parser_simulation_start.add_argument(
         '--debug', action='store_true', help="Start the simulation in debug mode")
+    parser_simulation_start.add_argument(
+        '--robot', action='store_true', help="Start also the robots when the simulation is ready (host only)")
     parser_simulation_start.set_defaults(func=simulation_start)
 
     # Add simulation set subcommand
@@ -103,24 +144,38 @@ def parser_simulation_menu(subparsers: argparse._SubParsersAction, params: Param
 
 
 def find_all_isaac_sim():
-    # Paths where Isaac Sim is usually installed
-    base_paths = [
-        os.path.expanduser("~/.local/share/ov/pkg"),
-        os.path.expanduser("~")
-    ]
+    # Return a dictionary with the version as key and the full path as value, sorted by latest version
+    return dict(_isaac_sim_installations())
+
+
+@functools.lru_cache(maxsize=None)
+def _isaac_sim_installations():
     isaac_sim_folders = {}
 
-    for base_path in base_paths:
-        if os.path.exists(base_path):
+    for base_path, prefix in ISAAC_SIM_BASE_PATHS:
+        try:
             # Look for directories in the base path
-            for folder in os.listdir(base_path):
-                full_path = os.path.join(base_path, folder)
-                if version := check_isaac_sim(full_path):
-                    isaac_sim_folders[version] = full_path
-    # Return a dictionary with the version as key and the full path as value, sorted by latest version
-    return dict(sorted(isaac_sim_folders.items(), key=lambda item: item[0], reverse=True))
+            with os.scandir(base_path) as entries:
+                folders = [entry.path for entry in entries if entry.name.lower().startswith(prefix) and entry.is_dir()]
+        except OSError:
+            continue
+        for full_path in folders:
+            if version := check_isaac_sim(full_path):
+                isaac_sim_folders[version] = full_path
+    # The installations are read once for each run, sorted by latest version
+    return tuple(sorted(isaac_sim_folders.items(), key=lambda item: _version_key(item[0]), reverse=True))
+
+
+def _version_key(version):
+    # Compare as versions, 4.10 is newer than 4.9, the versions not valid are sorted after the others
+    from packaging.version import parse, InvalidVersion  # type: ignore
+    try:
+        return (1, parse(version), version)
+    except InvalidVersion:
+        return (0, None, version)
 
 
+@functools.lru_cache(maxsize=None)
 def check_isaac_sim(full_path):
     """
     Validate if the given path contains a valid Isaac Sim installation.
@@ -130,23 +185,51 @@ def check_isaac_sim(full_path):
     :return: The version of Isaac Sim if valid, otherwise None.
     :rtype: str or None
     """
-    version_file = os.path.join(full_path, "VERSION")
-    isaac_sim_script = os.path.join(full_path, "isaac-sim.sh")
-    python_script = os.path.join(full_path, "python.sh")
-    if os.path.isfile(version_file) and os.path.isfile(isaac_sim_script) and os.path.isfile(python_script):
-        with open(version_file, 'r') as vf:
-            return vf.read().strip().split('-')[0]
+    # One listing of the folder, the file type comes with the entries
+    try:
+        with os.scandir(full_path) as entries:
+            files = {entry.name for entry in entries if entry.name in ISAAC_SIM_FILES and entry.is_file()}
+    except OSError:
+        return None
+    if len(files) == len(ISAAC_SIM_FILES):
+        return read_isaac_sim_version(full_path)
     return None
 
 
+def read_isaac_sim_version(isaac_sim_path):
+    """Return the version in the VERSION file of an Isaac Sim folder, cut before the first '-', None if missing."""
+    try:
+        with open(os.path.join(isaac_sim_path, "VERSION"), 'r') as vf:
+            return vf.read().split('-', 1)[0].strip()
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _isaac_sim_versions():
+    # Version of each Isaac Sim folder already found
+    return {path: version for version, path in _isaac_sim_installations()}
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_requirement(required):
+    from packaging.version import parse  # type: ignore
+    # Without any operator there is no condition to check
+    if not required or not any(op in required for op in '<>=!'):
+        return ()
+    # Extract conditions properly, with the operator function and the parsed version
+    return tuple((MAP_OPERATOR_VERSION[op], parse(ver)) for op, ver in PATTERN_VERSION.findall(required))
+
+
 def validate_isaac_sim(isaac_sim_path, required):
-    # Extract conditions properly
-    conditions = PATTERN_VERSION.findall(required)
+    from packaging.version import parse  # type: ignore
     if version := check_isaac_sim(isaac_sim_path):
-        return all(MAP_OPERATOR_VERSION[op](parse(version), parse(ver)) for op, ver in conditions)
+        installed = parse(version)
+        return all(op(installed, required_version) for op, required_version in _compile_requirement(required))
     return False
 
 
+@functools.lru_cache(maxsize=None)
 def is_gazebo_installed(folder="/usr/share/gazebo"):
     """
     Check if Gazebo is installed by verifying the existence of the Gazebo binary
@@ -155,10 +238,11 @@ def is_gazebo_installed(folder="/usr/share/gazebo"):
     :param folder: Path to the folder where Gazebo is typically installed (default: /usr/share/gazebo).
     :return: True if Gazebo is installed, False otherwise.
     """
-    if shutil.which("gazebo") or shutil.which("gz"):
+    # Gazebo Garden and later install gz, the classic gazebo binary is checked after
+    if shutil.which("gz") or shutil.which("gazebo"):
         return True
     # Check if the default Gazebo folder exists
-    return bool(os.path.exists(folder) and os.path.isdir(folder))
+    return os.path.isdir(folder)
 
 
 def is_simulation_tool_installed():
@@ -167,7 +251,8 @@ def is_simulation_tool_installed():
 
     :return: A dictionary indicating the installation status of Gazebo and Isaac Sim.
     """
-    return bool(find_all_isaac_sim()) or is_gazebo_installed()
+    # Gazebo is checked first, the Isaac Sim lookup scans the home folder
+    return is_gazebo_installed() or bool(find_all_isaac_sim())
 
 
 def simulation_info(platform, params: Params, verbose):
@@ -177,143 +262,239 @@ def simulation_info(platform, params: Params, verbose):
     # Get the simulation data from the parameters
     simulation_data = params.get('simulation', {})
 
-    def print_simulation_tool():
+    def simulation_tool_lines():
         isaac_sim_version = ""
         if 'isaac_sim_path' in simulation_data and simulation_data['tool'] == 'isaac-sim' and simulation_data['isaac_sim_path']:
-            version_file = os.path.join(simulation_data['isaac_sim_path'], "VERSION")
-            if os.path.isfile(version_file):
-                with open(version_file, 'r') as vf:
-                    isaac_sim_version = vf.read().strip().split('-')[0]  # Read the version from the VERSION file and cut after the first '-'
-        text_message = f"{TerminalFormatter.color_text('   selected:', bold=True)} {simulation_data['tool']} {isaac_sim_version}"
-        print(text_message)
+            isaac_sim_path = simulation_data['isaac_sim_path']
+            # Reuse the version read while looking for the installations, read the VERSION file only for other folders
+            isaac_sim_version = _isaac_sim_versions().get(isaac_sim_path) or read_isaac_sim_version(isaac_sim_path) or ""
+        tool_lines = [f"{_SELECTED_LABEL} {simulation_data['tool']} {isaac_sim_version}"]
         world_md = simulation_data.get('world', 'empty')
         world_string = TerminalFormatter.color_text(world_md, color='cyan')
-        print(f"{TerminalFormatter.color_text('   World:', bold=True)} {world_string}")
+        tool_lines.append(f"{_WORLD_LABEL} {world_string}")
         headless_md = simulation_data.get('headless', False)
-        headless_string = TerminalFormatter.color_text('enabled', color='green') if headless_md else TerminalFormatter.color_text('disabled', color='red')
-        print(f"{TerminalFormatter.color_text('   Headless mode:', bold=True)} {headless_string}")
+        headless_string = _HEADLESS_ENABLED if headless_md else _HEADLESS_DISABLED
+        tool_lines.append(f"{_HEADLESS_LABEL} {headless_string}")
         if headless_md and simulation_data['tool'] == 'isaac-sim':
             link_livestream = TerminalFormatter.clickable_link("https://docs.isaacsim.omniverse.nvidia.com/latest/installation/manual_livestream_clients.html")
-            print(f"{TerminalFormatter.color_text('   Livestream:', bold=True)} {link_livestream}")
+            tool_lines.append(f"{_LIVESTREAM_LABEL} {link_livestream}")
+        return tool_lines
 
     # Check if any simulation tools are installed
     if not is_simulation_tool_installed():
-        print(TerminalFormatter.color_text("No simulation tools installed", color='red'))
+        print(_NO_SIMULATION_TOOLS)
         return
 
-    print(TerminalFormatter.color_text("Simulation:", bold=True))
+    # Collect all lines and print them at once
+    lines = [_SIMULATION_LABEL]
     if 'tool' in simulation_data:
-        print_simulation_tool()
+        lines.extend(simulation_tool_lines())
 
     elif platform['Machine'] != 'aarch64':
-        print(TerminalFormatter.color_text("   No simulation tool selected", color='red'))
+        lines.append(TerminalFormatter.red("   No simulation tool selected"))
 
     # Check if Isaac Sim is installed
     if verbose:
         if isaac_sim_list := find_all_isaac_sim():
-            print(TerminalFormatter.color_text("   Isaac Sim installed:", bold=True))
-            for version, path in isaac_sim_list.items():
-                print(f"    - Isaac Sim {version}: {path}")
+            lines.append(TerminalFormatter.bold("   Isaac Sim installed:"))
+            lines.extend(f"    - Isaac Sim {version}: {path}" for version, path in isaac_sim_list.items())
         # Check if Gazebo is installed
         if is_gazebo_installed():
-            print(TerminalFormatter.color_text("   Gazebo is installed", bold=True))
+            lines.append(TerminalFormatter.bold("   Gazebo is installed"))
+    print("\n".join(lines))
+
+
+def _stop_process_groups(processes, timeout=5):
+    """Stop the launches and all their children, escalate from SIGINT to SIGTERM and SIGKILL if they do not exit."""
+    for stop_signal in (signal.SIGINT, signal.SIGTERM, signal.SIGKILL):
+        running = [process for process in processes if process.poll() is None]
+        if not running:
+            return
+        for process in running:
+            try:
+                os.killpg(process.pid, stop_signal)
+            except ProcessLookupError:
+                pass
+        # The launches shut down together, the timeout is shared
+        deadline = time.monotonic() + timeout
+        for process in running:
+            try:
+                process.wait(timeout=max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                pass
+
+
+def _stop_all_launches(stop_signal=None):
+    """Stop all the running launches and refuse the new ones, kill them at once with a signal."""
+    with _LAUNCH_LOCK:
+        _STOPPING.set()
+        running = list(_RUNNING_LAUNCHES)
+    if stop_signal is None:
+        _stop_process_groups(running)
+        return
+    for process in running:
+        try:
+            os.killpg(process.pid, stop_signal)
+        except ProcessLookupError:
+            pass
+    # Stopped launches are dropped
+    with _LAUNCH_LOCK:
+        _RUNNING_LAUNCHES.difference_update(process for process in running if process.poll() is not None)
+
+
+@contextlib.contextmanager
+def _interrupt_on_hangup():
+    """Turn SIGHUP and SIGTERM into a Ctrl-C while the launches run, the launches stop with the CLI."""
+    # Signal handlers can be set only from the main thread, where the signals are delivered
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
 
+    def interrupt(signum, frame):
+        raise KeyboardInterrupt
 
-def simulation_robot_start_debug(params, args):
+    previous = {signum: signal.signal(signum, interrupt) for signum in (signal.SIGHUP, signal.SIGTERM)}
+    try:
+        yield
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler if handler is not None else signal.SIG_DFL)
+
+
+def _run_in_workspace(workspace_path, command, capture, env=None, on_output=None, label=None):
+    """Run a command in the environment of a built workspace, capture stdout and stderr only to color the errors."""
+    pipe = subprocess.PIPE if capture else None
+    process = None
+    # The launches run in their own sessions, they do not get the hangup of the terminal
+    with _interrupt_on_hangup():
+        try:
+            # Load the sourced environment once, the command runs without a bash wrapper
+            try:
+                ros_env = load_ros_env(os.path.join(workspace_path, 'install', 'setup.bash')) if workspace_path else None
+            except subprocess.CalledProcessError:
+                # The setup file exists but fails to source
+                ros_env = None
+            if ros_env is None:
+                print(TerminalFormatter.red("Workspace not built. Build before to debug"))
+                return False
+            # The launch runs in its own process group, to be stopped with all its children
+            with _LAUNCH_LOCK:
+                if _STOPPING.is_set():
+                    return False
+                process = subprocess.Popen(
+                    command,
+                    stdout=pipe,
+                    stderr=pipe,
+                    env=dict(ros_env, **(env or {})),
+                    close_fds=False,
+                    start_new_session=True,
+                )
+                _RUNNING_LAUNCHES.add(process)
+            if capture:
+                # Stream stdout and stderr live
+                stream_process(process, on_output=on_output, label=label)
+            else:
+                # The command writes straight to the terminal
+                process.wait()
+            return process.returncode == 0
+        except KeyboardInterrupt:
+            # Ctrl-C reaches only this process, stop this launch and the ones started from the other threads
+            _stop_all_launches()
+            return False
+        except Exception as e:
+            print(f"An error occurred while running the command: {e}")
+            return False
+        finally:
+            # A launch still running, when its stop is interrupted, is left to the next stop
+            if process is not None and process.poll() is not None:
+                with _LAUNCH_LOCK:
+                    _RUNNING_LAUNCHES.discard(process)
+                for stream in (process.stdout, process.stderr):
+                    if stream is not None:
+                        stream.close()
+
+
+def simulation_robot_start_debug(params, args, capture=True, robot=None, labelled=False):
     nanosaur_ws_path = workspace.get_workspace_path(params, 'ws_simulation_name')
-    bash_file = os.path.join(nanosaur_ws_path, 'install', 'setup.bash')
     simulation_data = params.get('simulation', {})
-    # Check if the install folder exists
-    if not os.path.exists(bash_file):
-        print(TerminalFormatter.color_text("Workspace not built. Build before to debug", color='red'))
-        return False
     # Check which simulation tool is selected
     if 'tool' not in simulation_data:
-        print(TerminalFormatter.color_text("No simulation tool selected. Please select a simulator first.", color='red'))
+        print(TerminalFormatter.red("No simulation tool selected. Please select a simulator first."))
         return False
-    # Load the robot configuration
-    robot = RobotList.current_robot(params)
-    print(TerminalFormatter.color_text(f"Starting {robot}", color='green'))
+    # Load the robot configuration, the selected robot if not given
+    if robot is None:
+        robot = RobotList.current_robot(params)
+    print(TerminalFormatter.green(f"Starting {robot}"))
     # Check if the simulation tool is valid and get the command
     command = "ros2 launch nanosaur_simulation nanosaur_bringup.launch.py"
     ros_args = f"{robot.config_to_ros()} simulation_tool:={simulation_data['tool']}"
     # Command to execute
-    exec_command = f"ROS_DOMAIN_ID={robot.domain_id} {command} {ros_args} {' '.join(args)}"
+    exec_command = shlex.split(f"{command} {ros_args}") + list(args)
     # Print the command to be run
-    print(exec_command)
+    print(f"ROS_DOMAIN_ID={robot.domain_id} {shlex.join(exec_command)}")
 
-    try:
-        # Combine sourcing the bash file with running the command
-        process = subprocess.Popen(
-            f"source {bash_file} && {exec_command}",
-            shell=True,
-            executable="/bin/bash",
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        # Stream output live
-        for line in process.stdout:
-            # Decode and print stdout line-by-line
-            print(line.decode('utf-8'), end="")
-
-        # Wait for the process to finish
-        process.wait()
+    # The output lines start with the robot name when other launches share the terminal
+    label = robot.name if labelled else None
+    return _run_in_workspace(nanosaur_ws_path, exec_command, capture, env={'ROS_DOMAIN_ID': str(robot.domain_id)}, label=label)
 
-        # Stream any errors
-        for line in process.stderr:
-            print(TerminalFormatter.color_text(line.decode('utf-8'), color='red'), end="")  # Print stderr (errors) in red
 
-        return process.returncode == 0
-    except KeyboardInterrupt:
-        return False
-    except Exception as e:
-        print(f"An error occurred while running the command: {e}")
-        return False
+def simulation_robots_start_debug(params, args, capture=True, labelled=False):
+    """Start all the robots together, each one on its own ROS_DOMAIN_ID."""
+    robots = RobotList.load(params).to_list()
+    if len(robots) <= 1:
+        return simulation_robot_start_debug(params, args, capture, labelled=labelled)
+    with ThreadPoolExecutor(max_workers=len(robots)) as executor:
+        results = list(executor.map(lambda robot: simulation_robot_start_debug(params, args, capture, robot=robot, labelled=True), robots))
+    return all(results)
 
 
-def simulation_start_debug(simulation_ws_path, simulation_tool, params, args=None):
+def simulation_start_debug(simulation_ws_path, simulation_tool, params, args=None, capture=True):
     """Install the simulation tools."""
 
-    bash_file = f'{simulation_ws_path}/install/setup.bash'
-    # Check if the install folder exists
-    if not os.path.exists(bash_file):
-        print(TerminalFormatter.color_text("Workspace not built. Build before to debug", color='red'))
-        return False
-
-    cmd = simulation_tools[simulation_tool]
-    options = simulation_build_options(params, args)
-    command = f"{cmd} {options}"
+    command = simulation_tools[simulation_tool] + simulation_build_options(params, args)
     # Print the command to be run
-    logger.debug(command)
-    try:
-        # Combine sourcing the bash file with running the command
-        process = subprocess.Popen(
-            f"source {bash_file} && {command}",
-            shell=True,
-            executable="/bin/bash",
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        # Stream output live
-        for line in process.stdout:
-            # Decode and print stdout line-by-line
-            print(line.decode('utf-8'), end="")
-
-        # Wait for the process to finish
-        process.wait()
-
-        # Stream any errors
-        for line in process.stderr:
-            print(TerminalFormatter.color_text(line.decode('utf-8'), color='red'), end="")  # Print stderr (errors) in red
-
-        return process.returncode == 0
-    except KeyboardInterrupt:
-        return False
-    except Exception as e:
-        print(f"An error occurred while running the command: {e}")
-        return False
+    logger.debug(shlex.join(command))
+    return _run_in_workspace(simulation_ws_path, command, capture)
+
+
+def simulation_up(simulation_ws_path, simulation_tool, params):
+    """Start the simulation and the robots as soon as the simulation is ready."""
+    command = simulation_tools[simulation_tool] + simulation_build_options(params)
+    logger.debug(shlex.join(command))
+    # The robots start from the simulator output, in a thread while the simulator is streamed
+    # The output of the simulator and of the robots is labelled, all of them share the terminal
+    robot_thread = threading.Thread(target=simulation_robots_start_debug, args=(params, [], True, True), daemon=True)
+
+    # End of the previous chunk, a ready line can be split between two reads
+    tail = b''
+
+    def start_robot(chunk):
+        nonlocal tail
+        if robot_thread.ident is not None:
+            return
+        if SIMULATION_READY.search(tail + chunk):
+            robot_thread.start()
+        tail = chunk[-SIMULATION_READY_TAIL:]
+
+    _STOPPING.clear()
+    status = False
+    with _interrupt_on_hangup():
+        try:
+            status = _run_in_workspace(simulation_ws_path, command, True, on_output=start_robot, label=simulation_tool)
+        except KeyboardInterrupt:
+            # Ctrl-C again while the simulator stops, kill what is left
+            _stop_all_launches(signal.SIGKILL)
+        finally:
+            try:
+                # The robots stop with the simulator, then wait their shutdown
+                _stop_all_launches()
+                if robot_thread.ident is not None:
+                    robot_thread.join()
+            except KeyboardInterrupt:
+                # Ctrl-C again while stopping, kill what is left
+                _stop_all_launches(signal.SIGKILL)
+                status = False
+    return status
 
 
 def simulation_start(platform, params: Params, args):
@@ -321,32 +502,38 @@ def simulation_start(platform, params: Params, args):
     simulation_data = params.get('simulation', {})
     # Check which simulation tool is selected
     if 'tool' not in simulation_data:
-        print(TerminalFormatter.color_text("No simulation tool selected. Please run 'nanosaur simulation set' first.", color='red'))
+        print(TerminalFormatter.red("No simulation tool selected. Please run 'nanosaur simulation set' first."))
         return False
     # Check if the simulation tool is valid
     if simulation_data['tool'] not in simulation_tools:
-        print(TerminalFormatter.color_text(f"Unknown simulation tool: {simulation_data['tool']}", color='red'))
+        print(TerminalFormatter.red(f"Unknown simulation tool: {simulation_data['tool']}"))
         return False
     selected_location = simulation_data['location']
     # Check if the debug mode is enabled
     if selected_location == 'host':
         # Check if Isaac Sim is selected but no version is set
         if simulation_data['tool'] == 'isaac-sim' and 'isaac_sim_path' not in simulation_data:
-            print(TerminalFormatter.color_text("No Isaac Sim version selected. Please run simulation set first.", color='red'))
+            print(TerminalFormatter.red("No Isaac Sim version selected. Please run simulation set first."))
             return False
         nanosaur_ws_path = workspace.get_workspace_path(params, 'ws_simulation_name')
         simulator_tool = simulation_data['tool']
-        return simulation_start_debug(nanosaur_ws_path, simulator_tool, params)
+        # Save the parameters before the simulator takes over the terminal
+        params.save()
+        if getattr(args, 'robot', False):
+            return simulation_up(nanosaur_ws_path, simulator_tool, params)
+        return simulation_start_debug(nanosaur_ws_path, simulator_tool, params, capture=False)
     elif selected_location == 'docker':
         # Run from docker container
+        from nanosaur.docker import docker_simulator_start
         return docker_simulator_start(platform, params, args)
     else:
-        print(TerminalFormatter.color_text(f"Unknown debug mode: {selected_location}", color='red'))
+        print(TerminalFormatter.red(f"Unknown debug mode: {selected_location}"))
         return False
 
 
 def simulation_set(platform, params: Params, args):
     """Set the simulation tools."""
+    import inquirer
     # Get the nanosaur version
     nanosaur_version = params['nanosaur_version']
     # Get the ROS distro name
@@ -357,9 +544,8 @@ def simulation_set(platform, params: Params, args):
     # Capitalize the current tool name
     if current_tool:
         current_tool = current_tool.capitalize()
-    # Check if Gazebo is installed
-    if not is_gazebo_installed():
-        simulation_tools.pop('gazebo', None)
+    # Gazebo is listed only if installed
+    tool_choices = SIMULATION_TOOL_CHOICES if is_gazebo_installed() else tuple(tool for tool in SIMULATION_TOOL_CHOICES if tool != 'Gazebo')
     # Find all installed Isaac Sim versions
     isaac_sim_list = find_all_isaac_sim()
     # Get the version of Isaac Sim if it is already set
@@ -367,19 +553,19 @@ def simulation_set(platform, params: Params, args):
     if 'isaac_sim_path' in simulation_data:
         current_version = simulation_data['isaac_sim_path'].split("isaac-sim-")[-1]  # Extract version after "isaac-sim-"
     # Check if any simulation tools are available
-    if not simulation_tools:
-        print(TerminalFormatter.color_text("No simulation tools available. Please install a simulator first.", color='red'))
+    if not tool_choices:
+        print(TerminalFormatter.red("No simulation tools available. Please install a simulator first."))
         return False
     # check debug mode
     debug_mode = None
     if 'ws_debug' in params:
         debug_mode = params['ws_debug']
-        print(TerminalFormatter.color_text(f"Default debug mode: {debug_mode}", color='yellow'))
+        print(TerminalFormatter.yellow(f"Default debug mode: {debug_mode}"))
     # Get the ROS 2 installation path if available
     ros2_installed = get_ros2_path(ros_distro_name)
     debug_mode = 'docker' if ros2_installed is None else debug_mode
     # Get the Isaac Sim version required for the selected Nanosaur version
-    isaac_sim_required = nsv.NANOSAUR_DISTRO_MAP[params['nanosaur_version']]['isaac_sim']
+    isaac_sim_required = nsv.NANOSAUR_DISTRO_MAP[nanosaur_version]['isaac_sim']
     # Filter the list with only the valid Isaac Sim versions
     isaac_sim_list = {ver: path for ver, path in isaac_sim_list.items() if validate_isaac_sim(path, isaac_sim_required)}
     # Ask the user to select a simulation tool
@@ -387,14 +573,14 @@ def simulation_set(platform, params: Params, args):
         inquirer.List(
             'location',
             message="Run locally or on docker?",
-            choices=['docker', 'host'],
+            choices=list(SIMULATION_LOCATION_CHOICES),
             default=simulation_data.get('location', debug_mode),
             ignore=lambda answers: debug_mode,
         ),
         inquirer.List(
             'tool',
             message="Set the simulation tools",
-            choices=[tool.capitalize() for tool in simulation_tools.keys()],
+            choices=list(tool_choices),
             default=current_tool
         ),
         inquirer.List(
@@ -412,7 +598,7 @@ def simulation_set(platform, params: Params, args):
         )
     ]
     # Ask the user to select a simulation tool
-    answers = inquirer.prompt(questions, theme=GreenPassion())
+    answers = inquirer.prompt(questions, theme=green_theme())
     if answers is None:
         return False
     # Save the selected simulation tool
@@ -424,24 +610,26 @@ def simulation_set(platform, params: Params, args):
             if answers['isaac-sim'] == "Custom Path":
                 if version := check_isaac_sim(answers['custom_isaac_sim_path']):
                     if validate_isaac_sim(answers['custom_isaac_sim_path'], isaac_sim_required):
-                        print(TerminalFormatter.color_text(f"Selected Isaac Sim version: {version}", color='green'))
+                        print(TerminalFormatter.green(f"Selected Isaac Sim version: {version}"))
                     else:
-                        print(TerminalFormatter.color_text(f"Isaac Sim {version} not tested for this nanosaur version", color='yellow'))
+                        print(TerminalFormatter.yellow(f"Isaac Sim {version} not tested for this nanosaur version"))
                     simulation_data['isaac_sim_path'] = answers['custom_isaac_sim_path']
                 else:
-                    print(TerminalFormatter.color_text("Invalid Isaac Sim path", color='red'))
+                    print(TerminalFormatter.red("Invalid Isaac Sim path"))
                     return False
             else:
-                print(TerminalFormatter.color_text(f"Selected Isaac Sim version: {answers['isaac-sim']}", color='green'))
+                print(TerminalFormatter.green(f"Selected Isaac Sim version: {answers['isaac-sim']}"))
                 simulation_data['isaac_sim_path'] = isaac_sim_list[answers['isaac-sim']]
     else:
-        print(TerminalFormatter.color_text(f"Selected {answers['tool']}", color='green'))
+        print(TerminalFormatter.green(f"Selected {answers['tool']}"))
     # Store the new simulation data
     params['simulation'] = simulation_data
+    params.save()
     return True
 
 
 def simulation_set_headless(platform, params: Params, args):
+    import inquirer
     # Get the current simulation tool
     simulation_data = params.get('simulation', {})
     headless_mode = simulation_data.get('headless', False)
@@ -450,22 +638,24 @@ def simulation_set_headless(platform, params: Params, args):
         inquirer.List(
             'headless',
             message="Select if you want run the simulation in headless mode",
-            choices=['Yes', 'No'],
+            choices=list(HEADLESS_CHOICES),
             default='Yes' if headless_mode else 'No'
         )
     ]
     # Get the user's answer
-    answer = inquirer.prompt(question, theme=GreenPassion())
+    answer = inquirer.prompt(question, theme=green_theme())
     if answer is None:
         return False
     # Save the headless mode setting
     simulation_data['headless'] = (answer['headless'] == 'Yes')
     params['simulation'] = simulation_data
-    print(TerminalFormatter.color_text(f"Headless mode set to: {answer['headless']}", color='green'))
+    params.save()
+    print(TerminalFormatter.green(f"Headless mode set to: {answer['headless']}"))
     return True
 
 
 def simulation_set_world(platform, params: Params, args):
+    import inquirer
     # Get the current simulation tool
     simulation_data = params.get('simulation', {})
     world = simulation_data.get('world', '')
@@ -481,9 +671,10 @@ def simulation_set_world(platform, params: Params, args):
             all_worlds.append(args.new)
             simulation_data['world'] = args.new
             params['simulation'] = simulation_data
-            print(TerminalFormatter.color_text(f"World {args.new} added", color='green'))
+            params.save()
+            print(TerminalFormatter.green(f"World {args.new} added"))
         else:
-            print(TerminalFormatter.color_text(f"World {args.new} already exists", color='red'))
+            print(TerminalFormatter.red(f"World {args.new} already exists"))
             return False
         return True
 
@@ -497,13 +688,14 @@ def simulation_set_world(platform, params: Params, args):
         )
     ]
     # Get the user's answer
-    answer = inquirer.prompt(question, theme=GreenPassion())
+    answer = inquirer.prompt(question, theme=green_theme())
     if answer is None:
         return False
     # Save the selected world
     simulation_data['world'] = answer['world']
 
     params['simulation'] = simulation_data
+    params.save()
     # print(TerminalFormatter.color_text(f"Headless mode set to: {answer['headless']}", color='green'))
     return True
 # EOF
@@ -23,11 +23,9 @@
 # OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
 # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import inquirer
-from inquirer.themes import GreenPassion
 import argparse
 import logging
-from nanosaur.prompt_colors import TerminalFormatter
+from nanosaur.prompt_colors import TerminalFormatter, green_theme
 from nanosaur.utilities import Params, RobotList, Robot
 
 
@@ -35,12 +33,15 @@ from nanosaur.utilities import Params, RobotList, Robot
 logger = logging.getLogger(__name__)
 
 
-def parser_swarm_menu(subparsers: argparse._SubParsersAction, params: Params) -> argparse.ArgumentParser:
+def parser_swarm_menu(subparsers: argparse._SubParsersAction, params: Params, stub=False) -> argparse.ArgumentParser:
     # Get the robot index from the parameters
     try:
         current_robot_name = RobotList.current_robot(params).name
         # Subcommand: swarm (with a sub-menu for swarm operations)
         parser_swarm = subparsers.add_parser('swarm', help="Manage swarm Nanosaur robots")
+        # Only the command, the swarm operations are added when selected
+        if stub:
+            return parser_swarm
         swarm_subparsers = parser_swarm.add_subparsers(dest='swarm_type', help="Robot operations")
         # Add robot status subcommand
         parser_robot_new = swarm_subparsers.add_parser('new', help="Get a new robot to control")
@@ -64,6 +65,7 @@ def parser_swarm_menu(subparsers: argparse._SubParsersAction, params: Params) ->
 
 def robot_new(platform, params: Params, args):
     """Add a new robot configuration."""
+    import inquirer
 
     def validate_name(_, x):
         if not x.isalnum():
@@ -78,16 +80,17 @@ def robot_new(platform, params: Params, args):
             validate=validate_name,
         )
     ]
-    answers = inquirer.prompt(questions, theme=GreenPassion())
+    answers = inquirer.prompt(questions, theme=green_theme())
     robot = Robot(name=answers['name'])
     if RobotList.add_robot(params, robot):
-        print(TerminalFormatter.color_text("New robot configuration added", color='green'))
+        print(TerminalFormatter.green("New robot configuration added"))
         return True
-    print(TerminalFormatter.color_text("Robot configuration already exists", color='red'))
+    print(TerminalFormatter.red("Robot configuration already exists"))
 
 
 def robot_idx_set(platform, params: Params, args):
     """Set the robot configuration."""
+    import inquirer
     # Load the robot list
     robots = RobotList.load(params)
 
@@ -104,7 +107,7 @@ def robot_idx_set(platform, params: Params, args):
         )
     ]
     # Get the selected robot
-    answers = inquirer.prompt(options, theme=GreenPassion())
+    answers = inquirer.prompt(options, theme=green_theme())
     if answers is None:
         return False
     # Get the selected robot and its index
@@ -116,25 +119,26 @@ def robot_idx_set(platform, params: Params, args):
 
 def robot_remove(platform, params: Params, args):
     """Remove a robot configuration."""
+    import inquirer
     if args.robot_name is None:
         robot = RobotList.load(params).get_robot(params.get('robot_idx', 0))
         args.robot_name = robot.name
 
-    formatted_robot_name = TerminalFormatter.color_text(args.robot_name, color='green', bold=True)
+    formatted_robot_name = TerminalFormatter.green_bold(args.robot_name)
     questions = [
         inquirer.Confirm(
             'confirm',
-            message=f"Confirm {TerminalFormatter.color_text('remove', color='red', bold=True)} config for {formatted_robot_name}?",
+            message=f"Confirm {TerminalFormatter.red_bold('remove')} config for {formatted_robot_name}?",
             default=False
         )
     ]
-    answers = inquirer.prompt(questions, theme=GreenPassion())
+    answers = inquirer.prompt(questions, theme=green_theme())
     if answers is None:
         return False
     # Remove the robot configuration
     if answers['confirm']:
         RobotList.remove_robot(params, params.get('robot_idx', 0))
-        print(TerminalFormatter.color_text("Robot configuration removed", color='green'))
+        print(TerminalFormatter.green("Robot configuration removed"))
         return True
 
 
@@ -24,17 +24,26 @@
 # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import os
-import copy
+import sys
+import atexit
+import codecs
+import fcntl
+import selectors
+import json
+import hashlib
+import tempfile
+import threading
+import time
 import yaml
-import getpass
+import shlex
+import shutil
 import subprocess
-from functools import wraps
-import requests
+from functools import wraps, lru_cache
+from contextlib import contextmanager
 import logging
 import socket
-import pkg_resources
 import nanosaur.variables as nsv
-from nanosaur.prompt_colors import TerminalFormatter
+from nanosaur.prompt_colors import TerminalFormatter, RESET
 
 # Set up the logger
 logger = logging.getLogger(__name__)
@@ -52,6 +61,17 @@ CAMERA_CHOICES = ['', 'realsense', 'zed']
 LIDAR_CHOICES = ['', 'LD06', 'rplidar']
 ENGINES_CHOICES = ['vslam', 'nvblox', 'apriltag']
 
+# Escape sequence of the errors streamed from the commands
+_RED = f"\033[{TerminalFormatter.COLORS['red']}m"
+# libyaml loader and dumper when PyYAML is built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+# Pipe size for the streamed commands, F_SETPIPE_SZ is exposed only from Python 3.10
+PIPE_SIZE = 1 << 20
+F_SETPIPE_SZ = getattr(fcntl, 'F_SETPIPE_SZ', 1031)
+# The processes streamed from different threads write to the terminal one at a time
+_OUTPUT_LOCK = threading.Lock()
+
 
 NANOSAUR_CONFIG_FILE_NAME = 'nanosaur.yaml'
 NANOSAUR_HOME_NAME = 'nanosaur'
@@ -63,24 +83,116 @@ NANOSAUR_INSTAGRAM_URL = 'robo.panther'
 NANOSAUR_MAIN_GITHUB_URL = 'https://github.com/rnanosaur/nanosaur.git'
 
 NANOSAUR_DOCKER_USER = 'nanosaur'
+# The latest version on PyPI is reused for this time, in seconds
+PYPI_CACHE_TTL = 60 * 60
+PYPI_TIMEOUT = 5
 
 
 def simulation_build_options(params, args=None):
     # Retrieve simulation data from parameters
     simulation_data = params.get('simulation', {})
+    # Only the values used in the launch arguments are the cache key
+    return list(_simulation_launch_arguments(
+        simulation_data.get('headless', False),
+        simulation_data.get('isaac_sim_path', ''),
+        simulation_data.get('world', ''),
+        tuple(args) if args else (),
+    ))
+
+
+@lru_cache(maxsize=16)
+def _simulation_launch_arguments(headless, isaac_sim_path, world, args):
     # Define options with default values
     options = {
         # 'tool': simulation_data.get('tool', ''),
-        'headless': str(simulation_data.get('headless', False)).lower(),
-        'isaac_sim_path': simulation_data.get('isaac_sim_path', ''),
-        'world': simulation_data.get('world', '')
+        'headless': str(headless).lower(),
+        'isaac_sim_path': isaac_sim_path,
+        'world': world
     }
-    # Build the command string from options
-    command = ' '.join(f"{key}:={value}" for key, value in options.items() if value)
-    # Append additional arguments if provided
-    if args:
-        command = f"{command} {' '.join(args)}"
-    return command
+    # Build the launch arguments from options, then the additional arguments
+    return tuple(f"{key}:={value}" for key, value in options.items() if value) + args
+
+
+def _label_lines(data, label, prefix, suffix):
+    """Return the lines in data, each one starting with the label and styled."""
+    return b''.join(label + prefix + line + suffix + b'\n' for line in data.split(b'\n'))
+
+
+def stream_process(process, chunk_size=65536, on_output=None, label=None):
+    """Copy stdout and stderr (in red) of a process to the terminal as they arrive, then wait for it.
+
+    If set, on_output is called with every chunk of bytes read.
+    If set, the output is written by whole lines, each one starting with the label.
+    """
+    # A stream not piped, or merged in stdout, is skipped
+    styles = {pipe: style for pipe, style in ((process.stdout, ("", "")), (process.stderr, (_RED, RESET))) if pipe is not None}
+    styles_bytes = {pipe: (prefix.encode(), suffix.encode()) for pipe, (prefix, suffix) in styles.items()}
+    label_bytes = TerminalFormatter.bold(f"[{label}] ").encode() if label is not None else None
+    # A line not ended yet, waiting for the next chunk
+    pending = {pipe: b'' for pipe in styles}
+    # Bytes go straight to the terminal, a text only stdout gets the chunks decoded
+    output = getattr(sys.stdout, 'buffer', None)
+    decoders = {pipe: codecs.getincrementaldecoder('utf-8')(errors='replace') for pipe in styles}
+    sys.stdout.flush()
+    with selectors.DefaultSelector() as selector:
+        for pipe in styles:
+            # A larger pipe holds the bursts of output with less reads, the default size is kept if not allowed
+            try:
+                fcntl.fcntl(pipe.fileno(), F_SETPIPE_SZ, PIPE_SIZE)
+            except OSError:
+                pass
+            selector.register(pipe, selectors.EVENT_READ)
+        while selector.get_map():
+            for key, _ in selector.select():
+                chunk = os.read(key.fd, chunk_size)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                elif on_output is not None:
+                    on_output(chunk)
+                data = chunk
+                if output is None:
+                    # A character split between two chunks is completed by the decoder with the next chunk
+                    data = decoders[key.fileobj].decode(chunk, final=not chunk).encode()
+                prefix, suffix = styles_bytes[key.fileobj]
+                if label_bytes is not None:
+                    data = pending[key.fileobj] + data
+                    # Only whole lines are written, the last one waits for its end or the end of the stream
+                    if chunk:
+                        data, newline, pending[key.fileobj] = data.rpartition(b'\n')
+                    else:
+                        newline = data
+                    data = _label_lines(data, label_bytes, prefix, suffix) if newline else b''
+                elif data:
+                    data = prefix + data + suffix
+                if not data:
+                    continue
+                with _OUTPUT_LOCK:
+                    if output is not None:
+                        output.write(data)
+                        output.flush()
+                    else:
+                        sys.stdout.write(data.decode())
+                        sys.stdout.flush()
+    return process.wait()
+
+
+# Robot attributes with a different name in the ROS launch arguments
+_ROS_PARAM_NAMES = {
+    'name': 'robot_name',
+    'simulation': 'use_sim_time'
+}
+
+
+@lru_cache(maxsize=32)
+def _ros_arguments(robot_items):
+    ros_params = []
+    for key, value in robot_items:
+        if key == 'domain_id' or not value:
+            continue
+        if isinstance(value, tuple):
+            value = f'"[{", ".join(value)}]"'
+        ros_params.append(f"{_ROS_PARAM_NAMES.get(key, key)}:={value}")
+    return ' '.join(ros_params)
 
 
 class Robot:
@@ -91,6 +203,7 @@ class Robot:
 
     def __init__(self, robot_config=None, name=None):
         if robot_config is None:
+            import copy
             robot_config = copy.deepcopy(DEFAULT_ROBOT_CONFIG)
         if name is not None:
             robot_config['name'] = name
@@ -111,39 +224,34 @@ class Robot:
         return self.__dict__
 
     def config_to_ros(self) -> str:
-        ros_params = []
-        for key, value in self.__dict__.items():
-            if key == 'domain_id' or not value:
-                continue
-            param_name = {
-                'name': 'robot_name',
-                'simulation': 'use_sim_time'
-            }.get(key, key)
-            if isinstance(value, list):
-                value = f'"[{", ".join(value)}]"'
-            ros_params.append(f"{param_name}:={value}")
-        return ' '.join(ros_params)
+        # Lists are made hashable, the same configuration is formatted only once
+        robot_items = tuple((key, tuple(value) if isinstance(value, list) else value) for key, value in self.__dict__.items())
+        try:
+            return _ros_arguments(robot_items)
+        except TypeError:
+            # Other unhashable values are formatted without the cache
+            return _ros_arguments.__wrapped__(robot_items)
 
     def verbose(self):
         """Print the robot configuration."""
         if self.simulation:
-            print(TerminalFormatter.color_text("Robot: (simulated)", bold=True, color='magenta'))
+            print(TerminalFormatter.magenta_bold("Robot: (simulated)"))
         else:
-            print(TerminalFormatter.color_text("Robot:", bold=True))
-        print(f"  {TerminalFormatter.color_text('Name:', bold=True)} {self.name}")
-        print(f"  {TerminalFormatter.color_text('Domain ID:', bold=True)} {self.domain_id}")
-        print(f"  {TerminalFormatter.color_text('Camera:', bold=True)} {self.camera_type or 'not set'}")
-        print(f"  {TerminalFormatter.color_text('Lidar:', bold=True)} {self.lidar_type or 'not set'}")
-        print(f"  {TerminalFormatter.color_text('Engines:', bold=True)} {', '.join(self.engines) if self.engines else 'not set'}")
+            print(TerminalFormatter.bold("Robot:"))
+        print(f"  {TerminalFormatter.bold('Name:')} {self.name}")
+        print(f"  {TerminalFormatter.bold('Domain ID:')} {self.domain_id}")
+        print(f"  {TerminalFormatter.bold('Camera:')} {self.camera_type or 'not set'}")
+        print(f"  {TerminalFormatter.bold('Lidar:')} {self.lidar_type or 'not set'}")
+        print(f"  {TerminalFormatter.bold('Engines:')} {', '.join(self.engines) if self.engines else 'not set'}")
         # Print other attributes
         if other_attributes := {
             key: value
             for key, value in self.__dict__.items()
             if key not in ['name', 'simulation', 'domain_id', 'camera_type', 'lidar_type', 'engines']
         }:
-            print(f"  {TerminalFormatter.color_text('Other attributes:', bold=True)}")
+            print(f"  {TerminalFormatter.bold('Other attributes:')}")
             for key, value in other_attributes.items():
-                print(f"    {TerminalFormatter.color_text(f'{key}:', bold=True)} {value}")
+                print(f"    {TerminalFormatter.bold(f'{key}:')} {value}")
 
 
 class RobotList:
@@ -156,8 +264,9 @@ class RobotList:
     def add_robot(cls, params, robot, save=True) -> bool:
         robot_list = cls.load(params)
         if robot_list._add_robot(robot):
-            params.set('robots', robot_list.to_dict(), save=save)
-            params.set('robot_idx', len(robot_list.to_list()) - 1, save=save)
+            with params.batch():
+                params.set('robots', robot_list.to_dict(), save=save)
+                params.set('robot_idx', len(robot_list.to_list()) - 1, save=save)
             return True
         return False
 
@@ -165,16 +274,17 @@ class RobotList:
     def remove_robot(cls, params, robot_idx=None):
         robot_list = cls.load(params)
         idx = robot_idx if robot_idx is not None else params.get('robot_idx', 0)
-        if idx == 0:
-            if 'robots' in params:
-                del params['robots']
-            if 'robot_idx' in params:
-                del params['robot_idx']
-        else:
-            robot_list._remove_robot(idx)
-            params['robots'] = robot_list.to_dict()
-            if 'robot_idx' in params and params['robot_idx'] > 0:
-                params['robot_idx'] -= 1
+        with params.batch():
+            if idx == 0:
+                if 'robots' in params:
+                    del params['robots']
+                if 'robot_idx' in params:
+                    del params['robot_idx']
+            else:
+                robot_list._remove_robot(idx)
+                params['robots'] = robot_list.to_dict()
+                if 'robot_idx' in params and params['robot_idx'] > 0:
+                    params['robot_idx'] -= 1
 
     @classmethod
     def update_robot(cls, params, robot) -> bool:
@@ -182,6 +292,7 @@ class RobotList:
         idx = params.get('robot_idx', 0)
         if robot_list._update_robot(robot, idx):
             params['robots'] = robot_list.to_dict()
+            params.save()
             return True
         return False
 
@@ -189,8 +300,15 @@ class RobotList:
     def current_robot(cls, params, idx=None) -> Robot:
         if idx is None:
             idx = params.get('robot_idx', 0)
+        # Build only the selected robot
+        if 'robots' in params:
+            return Robot(params['robots'][idx])
         return cls.load(params).get_robot(idx)
 
+    @classmethod
+    def count(cls, params) -> int:
+        return len(params['robots']) if 'robots' in params else 0
+
     @classmethod
     def load(cls, params):
         return cls() if 'robots' not in params else cls(params['robots'])
@@ -242,14 +360,101 @@ class RobotList:
 
     def print_all_robots(self, robot_idx=None):
         if robot_idx is not None:
-            print(TerminalFormatter.color_text(f"All robots: (selected: {robot_idx})", bold=True))
+            print(TerminalFormatter.bold(f"All robots: (selected: {robot_idx})"))
         else:
-            print(TerminalFormatter.color_text("All robots:", bold=True))
+            print(TerminalFormatter.bold("All robots:"))
         for idx, robot in enumerate(self.robots):
             if idx == robot_idx:
-                print(f"  {TerminalFormatter.color_text(f'Robot {idx}:', bold=True)} {TerminalFormatter.color_text(robot, color='green')}")
+                print(f"  {TerminalFormatter.bold(f'Robot {idx}:')} {TerminalFormatter.green(robot)}")
             else:
-                print(f"  {TerminalFormatter.color_text(f'Robot {idx}:', bold=True)} {robot}")
+                print(f"  {TerminalFormatter.bold(f'Robot {idx}:')} {robot}")
+
+
+def _read_params_cache(params_file, stat):
+    """Return the parameters from the JSON cache, None if missing or older than the YAML file."""
+    try:
+        with open(os.path.join(get_nanosaur_cache(), 'params.json'), 'r') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if cache.get('file') != params_file or cache.get('mtime_ns') != stat.st_mtime_ns or cache.get('size') != stat.st_size:
+        return None
+    return cache.get('params')
+
+
+def _write_params_cache(params_file, params_dict):
+    """Store the parameters parsed from the YAML file in the JSON cache."""
+    try:
+        # Skip parameters that JSON cannot store as they are
+        if json.loads(json.dumps(params_dict)) != params_dict:
+            return
+        stat = os.stat(params_file)
+        cache_path = os.path.join(get_nanosaur_cache(), 'params.json')
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(f"{cache_path}.tmp", 'w') as file:
+            json.dump({'file': params_file, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'params': params_dict}, file)
+        os.replace(f"{cache_path}.tmp", cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Cannot write the parameters cache: {e}")
+
+
+# Variables that change on every shell and do not change what a setup file exports
+_VOLATILE_ENV = frozenset(['_', 'SHLVL', 'PWD', 'OLDPWD'])
+# Separator between the environment before and after sourcing a setup file
+_SOURCED_MARKER = '__NANOSAUR_SOURCED__'
+
+
+def _parse_env(output):
+    return dict(item.split('=', 1) for item in output.split('\0') if '=' in item)
+
+
+def load_ros_env(bash_file):
+    """Return the environment after sourcing a bash file, None if the file is missing.
+
+    The changes made by the bash file are cached for the current environment, until the file changes.
+    """
+    try:
+        stat = os.stat(bash_file)
+    except OSError:
+        return None
+    # The same file exports different values from a different environment
+    environment = {key: value for key, value in os.environ.items() if key not in _VOLATILE_ENV}
+    env_key = hashlib.sha1(json.dumps(environment, sort_keys=True).encode()).hexdigest()
+    cache_path = os.path.join(get_nanosaur_cache(), 'ros-env.json')
+    try:
+        with open(cache_path, 'r') as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(bash_file, {})
+    if entry.get('mtime_ns') != stat.st_mtime_ns or entry.get('size') != stat.st_size or entry.get('env_key') != env_key:
+        # The environment before and after sourcing is read in the same shell
+        result = subprocess.run(
+            ["/bin/bash", "-c", f"env -0; printf '{_SOURCED_MARKER}\\0'; source {shlex.quote(bash_file)} && env -0"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True
+        )
+        before, after = (_parse_env(part) for part in result.stdout.decode().split(f"{_SOURCED_MARKER}\0", 1))
+        entry = cache[bash_file] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'env_key': env_key,
+            'set': {key: value for key, value in after.items() if key not in _VOLATILE_ENV and before.get(key) != value},
+            'unset': [key for key in before if key not in after and key not in _VOLATILE_ENV],
+        }
+        try:
+            cache_folder = os.path.dirname(cache_path)
+            os.makedirs(cache_folder, exist_ok=True)
+            # A unique temporary file, the robots load their environment together
+            fd, tmp_path = tempfile.mkstemp(dir=cache_folder, prefix='ros-env.', suffix='.tmp')
+            with os.fdopen(fd, 'w') as file:
+                json.dump(cache, file)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.debug(f"Cannot write the ROS environment cache: {e}")
+    env = dict(os.environ, **entry['set'])
+    for key in entry['unset']:
+        env.pop(key, None)
+    return env
 
 
 class Params:
@@ -257,18 +462,28 @@ class Params:
     @classmethod
     def load(cls, default_params):
         params_file = Params.get_params_file()
-        # Load parameters from YAML file if it exists
-        if os.path.exists(params_file):
-            with open(params_file, 'r') as file:
-                params_dict = yaml.safe_load(file)
-        else:
-            params_dict = default_params
+        # Load parameters from YAML file if it exists, the JSON cache is used until the file changes
+        try:
+            file = open(params_file, 'rb')
+        except FileNotFoundError:
+            return cls(default_params)
+        with file:
+            params_dict = _read_params_cache(params_file, os.fstat(file.fileno()))
+            if params_dict is None:
+                # The loader reads the bytes and detects the encoding, no text layer is needed
+                params_dict = yaml.load(file, Loader=YAML_LOADER)
+                _write_params_cache(params_file, params_dict)
 
         return cls(params_dict)
 
     def __init__(self, params_dict):
         self._params_dict = params_dict
-        self._default_params = copy.deepcopy(params_dict)
+        # Serialized copy of the parameters, to detect the changes without copying them
+        self._baseline = Params._fingerprint(params_dict)
+        # Changes are written once, at exit or at the end of a batch
+        self._dirty_keys = set()
+        self._batch_depth = 0
+        self._save_scheduled = False
         for key, value in params_dict.items():
             setattr(self, key, value)
 
@@ -279,13 +494,13 @@ class Params:
         self._params_dict[key] = value
         setattr(self, key, value)
         # save the new value in the file
-        self.save()
+        self._mark_dirty(key)
 
     def __delitem__(self, key):
         del self._params_dict[key]
         delattr(self, key)
         # save the new value in the file
-        self.save()
+        self._mark_dirty(key)
 
     def __contains__(self, key):
         return key in self._params_dict
@@ -293,16 +508,49 @@ class Params:
     def __repr__(self):
         return str(self._params_dict)
 
+    def _mark_dirty(self, key):
+        self._dirty_keys.add(key)
+        # The file is written when the process exits, if not already saved
+        if not self._save_scheduled:
+            atexit.register(self.save)
+            self._save_scheduled = True
+
+    @contextmanager
+    def batch(self):
+        """Group several changes and write them once at the end of the block."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            # Only the changes marked to be saved are written
+            if self._batch_depth == 0 and self._dirty_keys:
+                self.save()
+
     def save(self):
+        """Write all the changed parameters to the file, including the ones set with save=False."""
+        # Inside a batch the changes are written at the end of the block
+        if self._batch_depth:
+            return
         params_file = Params.get_params_file()
         # Save the parameters to the file if they are different from the default
-        if params_file and self._params_dict != self._default_params:
+        if params_file and Params._fingerprint(self._params_dict) != self._baseline:
             # Get the current nanosaur's home directory
             create_nanosaur_home()
-            # Save the parameters to the file
-            logger.debug(TerminalFormatter.color_text(f"Saving parameters to {params_file}", color='yellow'))
-            with open(params_file, 'w') as file:
-                yaml.dump(self._params_dict, file)
+            # Save the parameters to the file, replaced only when fully written
+            logger.debug(TerminalFormatter.yellow(f"Saving {', '.join(sorted(self._dirty_keys)) or 'parameters'} to {params_file}"))
+            with open(f"{params_file}.tmp", 'w') as file:
+                yaml.dump(self._params_dict, file, Dumper=YAML_DUMPER)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(f"{params_file}.tmp", params_file)
+            _write_params_cache(params_file, self._params_dict)
+            self._baseline = Params._fingerprint(self._params_dict)
+        self._dirty_keys.clear()
+
+    @staticmethod
+    def _fingerprint(params_dict) -> str:
+        return json.dumps(params_dict, sort_keys=True, default=repr)
 
     @staticmethod
     def get_params_file() -> str:
@@ -313,11 +561,12 @@ class Params:
         return getattr(self, key, default)
 
     def set(self, key, value, save=True):
+        """Set a parameter, written at exit if save is True, otherwise only by the next save."""
         self._params_dict[key] = value
         setattr(self, key, value)
         # save the new value in the file
         if save:
-            self.save()
+            self._mark_dirty(key)
         return value
 
     def items(self):
@@ -330,75 +579,99 @@ def is_env_file():
     return os.path.exists(env_path)
 
 
-def build_env_file(params):
+def _env_file_content(params):
+    """Return the path and the content of the env file for the current robot."""
     nanosaur_home_path = get_nanosaur_home()
     # Get current robot running
     robot = RobotList.current_robot(params)
     uid = os.getuid()
     gid = os.getgid()
     env_path = os.path.join(nanosaur_home_path, f'{robot.name}.env')
-    # Create a .env file and save UID and GID
+    # Save UID and GID
+    lines = [f"USER_UID={uid}", f"USER_GID={gid}"]
+    # Robot home folder
+    lines.append(f"ROBOT_HOME={nanosaur_home_path}")
+    # Pass robot name
+    lines.append(f"ROBOT_NAME={robot.name}")
+    # Pass robot simulation type
+    core_tag = "simulation" if robot.simulation else "robot"
+    lines.append(f"CORE_TAG={core_tag}")
+    # Pass robot perception type
+    if robot.simulation:
+        perception_tag = "simulation"
+    elif robot.camera_type == 'realsense':
+        perception_tag = "realsense"
+    elif robot.camera_type == 'zed':
+        perception_tag = "zed"
+    else:
+        perception_tag = "none"
+    lines.append(f"PERCEPTION_TAG={perception_tag}")
+    # Load all commands to pass to the simulation
+    if 'simulation' in params:
+        simulation_commands = simulation_build_options(params)
+        lines.append(f"SIMULATION_COMMANDS={' '.join(simulation_commands)}")
+    # Pass the nanosaur version
+    nanosaur_version = params['nanosaur_version']
+    if nsv.NANOSAUR_CURRENT_DISTRO != nanosaur_version:
+        if '-' in nanosaur_version:
+            nanosaur_version = nanosaur_version.split('-')[0]
+        lines.append(f"NANOSAUR_VERSION=-{nsv.NANOSAUR_CURRENT_DISTRO}")
+
+    # Pass robot ros commands
+    ros_args = robot.config_to_ros()
+    if 'simulation' in params:
+        simulation_data = params['simulation']
+        ros_args += f" simulation_tool:={simulation_data['tool']}"
+    lines.append(f"COMMANDS={ros_args}")
+    return env_path, "\n".join(lines) + "\n"
+
+
+def build_env_file(params):
+    env_path, content = _env_file_content(params)
+    # Create a .env file
     with open(env_path, 'w') as env_file:
-        env_file.write(f"USER_UID={uid}\n")
-        env_file.write(f"USER_GID={gid}\n")
-        # Robot home folder
-        env_file.write(f"ROBOT_HOME={nanosaur_home_path}\n")
-        # Pass robot name
-        env_file.write(f"ROBOT_NAME={robot.name}\n")
-        # Pass robot simulation type
-        core_tag = "simulation" if robot.simulation else "robot"
-        env_file.write(f"CORE_TAG={core_tag}\n")
-        # Pass robot perception type
-        if robot.simulation:
-            perception_tag = "simulation"
-        elif robot.camera_type == 'realsense':
-            perception_tag = "realsense"
-        elif robot.camera_type == 'zed':
-            perception_tag = "zed"
-        else:
-            perception_tag = "none"
-        env_file.write(f"PERCEPTION_TAG={perception_tag}\n")
-        # Load all commands to pass to the simulation
-        if 'simulation' in params:
-            simulation_commands = simulation_build_options(params)
-            env_file.write(f"SIMULATION_COMMANDS={simulation_commands}\n")
-        # Pass the nanosaur version
-        nanosaur_version = params['nanosaur_version']
-        if nsv.NANOSAUR_CURRENT_DISTRO != nanosaur_version:
-            if '-' in nanosaur_version:
-                nanosaur_version = nanosaur_version.split('-')[0]
-            env_file.write(f"NANOSAUR_VERSION=-{nsv.NANOSAUR_CURRENT_DISTRO}\n")
-
-        # Pass robot ros commands
-        ros_args = robot.config_to_ros()
-        if 'simulation' in params:
-            simulation_data = params['simulation']
-            ros_args += f" simulation_tool:={simulation_data['tool']}"
-        env_file.write(f"COMMANDS={ros_args}\n")
+        env_file.write(content)
+
+
+def build_env_file_if_stale(params):
+    """Write the env file only if its content changed, return True when it has been written."""
+    env_path, content = _env_file_content(params)
+    try:
+        with open(env_path, 'r') as env_file:
+            if env_file.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    # Write to a temporary file and replace it, compose never reads a partial env file
+    tmp_path = f"{env_path}.tmp"
+    with open(tmp_path, 'w') as env_file:
+        env_file.write(content)
+    os.replace(tmp_path, env_path)
+    return True
 
 
 def package_info(params: Params, verbose: bool):
     # Print version information
     sponsor_url = TerminalFormatter.clickable_link(NANOSAUR_SPONSOR_URL)
-    print(f"{TerminalFormatter.color_text(' 💖 Sponsor:', bold=True)} {sponsor_url}")
+    print(f"{TerminalFormatter.bold(' 💖 Sponsor:')} {sponsor_url}")
     nanosaur_website = TerminalFormatter.clickable_link(NANOSAUR_WEBSITE_URL)
-    print(f"{TerminalFormatter.color_text(' 🦕 Nanosaur website:', bold=True)} {nanosaur_website}")
+    print(f"{TerminalFormatter.bold(' 🦕 Nanosaur website:')} {nanosaur_website}")
     nanosaur_discord = TerminalFormatter.clickable_link(NANOSAUR_DISCORD_URL)
-    print(f"{TerminalFormatter.color_text(' 🎮 Nanosaur Discord:', bold=True)} {nanosaur_discord}")
+    print(f"{TerminalFormatter.bold(' 🎮 Nanosaur Discord:')} {nanosaur_discord}")
     nanosaur_instagram = TerminalFormatter.clickable_link(f"https://www.instagram.com/{NANOSAUR_INSTAGRAM_URL}")
-    print(f"{TerminalFormatter.color_text(f' 📸 Follow {NANOSAUR_INSTAGRAM_URL}:', bold=True)} {nanosaur_instagram}")
+    print(f"{TerminalFormatter.bold(f' 📸 Follow {NANOSAUR_INSTAGRAM_URL}:')} {nanosaur_instagram}")
     nanosaur_home_folder = TerminalFormatter.clickable_link(get_nanosaur_home())
-    print(f"{TerminalFormatter.color_text(' 📂 Nanosaur home:', bold=True)} {nanosaur_home_folder}")
+    print(f"{TerminalFormatter.bold(' 📂 Nanosaur home:')} {nanosaur_home_folder}")
     # Print verbose information
 
     def print_verbose_info(params):
         nanosaur_github_url = TerminalFormatter.clickable_link(NANOSAUR_GITHUB_ORG_URL)
-        print(f"{TerminalFormatter.color_text(' 🐱 GitHub:', bold=True)} {nanosaur_github_url}")
+        print(f"{TerminalFormatter.bold(' 🐱 GitHub:')} {nanosaur_github_url}")
         nanosaur_docker_user = get_nanosaur_docker_user(params)
         nanosaur_docker_home = TerminalFormatter.clickable_link(f"https://hub.docker.com/u/{nanosaur_docker_user}")
-        print(f"{TerminalFormatter.color_text(' 🐳 Docker Hub:', bold=True)} {nanosaur_docker_home}")
+        print(f"{TerminalFormatter.bold(' 🐳 Docker Hub:')} {nanosaur_docker_home}")
         config_file_path = TerminalFormatter.clickable_link(Params.get_params_file())
-        print(f"{TerminalFormatter.color_text('Nanosaur config file:', bold=True)} {config_file_path}")
+        print(f"{TerminalFormatter.bold('Nanosaur config file:')} {config_file_path}")
     if verbose:
         print_verbose_info(params)
 
@@ -425,7 +698,7 @@ def create_nanosaur_home() -> str:
     # Check if folder exists, if not, create it
     if not os.path.exists(nanosaur_home_path):
         os.makedirs(nanosaur_home_path)
-        logger.debug(TerminalFormatter.color_text(f"Folder '{nanosaur_home_path}' created.", color='green'))
+        logger.debug(TerminalFormatter.green(f"Folder '{nanosaur_home_path}' created."))
     return nanosaur_home_path
 
 
@@ -438,16 +711,23 @@ def get_nanosaur_home() -> str:
     return os.path.join(os.path.expanduser("~"), NANOSAUR_HOME_NAME)
 
 
+def get_nanosaur_cache() -> str:
+    """ Get the nanosaur cache directory. """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, NANOSAUR_HOME_NAME)
+
+
 def download_file(url, folder_path, file_name, force=False) -> str:
     # Create the full file path
     file_path = os.path.join(folder_path, file_name)
 
     # Check if the file already exists
     if not force and os.path.exists(file_path):
-        logger.debug(TerminalFormatter.color_text(f"File '{file_name}' already exists in '{folder_path}'. Skip download", color='yellow'))
+        logger.debug(TerminalFormatter.yellow(f"File '{file_name}' already exists in '{folder_path}'. Skip download"))
         return file_path  # Cancel download
 
     # Send a request to download the file
+    import requests
     response = requests.get(url)
 
     if response.status_code == 200:
@@ -455,27 +735,46 @@ def download_file(url, folder_path, file_name, force=False) -> str:
         file_path = os.path.join(folder_path, file_name)
         with open(file_path, 'wb') as file:
             file.write(response.content)
-        logger.debug(TerminalFormatter.color_text(f"File '{file_name}' downloaded successfully to '{folder_path}'.", color='green'))
+        logger.debug(TerminalFormatter.green(f"File '{file_name}' downloaded successfully to '{folder_path}'."))
         return file_path
     else:
-        print(TerminalFormatter.color_text(f"Failed to download file. Status code: {response.status_code}", color='red'))
+        print(TerminalFormatter.red(f"Failed to download file. Status code: {response.status_code}"))
         return None
 
 
-def get_latest_version(package_name):
-    """Fetch the latest version of a package from PyPI."""
+@lru_cache(maxsize=8)
+def get_latest_version(package_name, use_cache=True):
+    """Fetch the latest version of a package from PyPI, the answer is reused for an hour."""
+    cache_path = os.path.join(get_nanosaur_cache(), f"pypi-{package_name}.json")
+    if use_cache:
+        try:
+            if time.time() - os.stat(cache_path).st_mtime < PYPI_CACHE_TTL:
+                with open(cache_path, 'r') as file:
+                    return json.load(file)['version']
+        except (OSError, ValueError, KeyError):
+            pass
     url = f"https://pypi.org/pypi/{package_name}/json"
-    response = requests.get(url)
+    import requests
+    response = requests.get(url, timeout=PYPI_TIMEOUT)
     if response.status_code == 200:
-        return response.json()["info"]["version"]
+        version = response.json()["info"]["version"]
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(f"{cache_path}.tmp", 'w') as file:
+                json.dump({'version': version}, file)
+            os.replace(f"{cache_path}.tmp", cache_path)
+        except OSError:
+            pass
+        return version
     return None
 
 
 def get_installed_version(package_name):
     """Get the installed version of a package."""
+    from importlib import metadata
     try:
-        return pkg_resources.get_distribution(package_name).version
-    except pkg_resources.DistributionNotFound:
+        return metadata.version(package_name)
+    except metadata.PackageNotFoundError:
         return None
 
 
@@ -492,9 +791,7 @@ def require_sudo(func):
     def wrapper(*args, **kwargs):
         if os.geteuid() != 0:
             print(
-                TerminalFormatter.color_text(
-                    "This script must be run as root. Please use 'sudo'.",
-                    color='red'))
+                TerminalFormatter.red("This script must be run as root. Please use 'sudo'."))
             return False
         return func(*args, **kwargs)
     return wrapper
@@ -503,16 +800,19 @@ def require_sudo(func):
 def require_sudo_password(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
+        # Use the absolute path, posix_spawn is used only when the executable has a directory
+        sudo = shutil.which("sudo") or "sudo"
         try:
-            subprocess.run(["sudo", "-v"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            subprocess.run([sudo, "-v"], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=False)
         except subprocess.CalledProcessError:
+            import getpass
             password = getpass.getpass("Enter your sudo password: ")
-            proc = subprocess.Popen(["sudo", "-S", "-v"],
-                                    stdin=subprocess.PIPE,
-                                    stdout=subprocess.PIPE,
-                                    stderr=subprocess.PIPE)
-            out, err = proc.communicate(password.encode() + b'\n')
-            if proc.returncode != 0:
+            try:
+                result = subprocess.run([sudo, "-S", "-v"], input=password.encode() + b'\n',
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, close_fds=False, timeout=10)
+            except subprocess.TimeoutExpired:
+                result = None
+            if result is None or result.returncode != 0:
                 print("Failed to authenticate sudo.")
                 return
         return func(*args, **kwargs)
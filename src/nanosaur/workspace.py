@@ -31,10 +31,7 @@ import logging
 import nanosaur.variables as nsv
 from nanosaur.prompt_colors import TerminalFormatter
 from nanosaur import ros
-from nanosaur.docker import docker_service_run_command
-from nanosaur.simulation import simulation_robot_start_debug, simulation_start_debug
 from nanosaur import utilities
-import inquirer
 
 # Set up the logger
 logger = logging.getLogger(__name__)
@@ -47,6 +44,8 @@ COLCON_DEFAULTS = {
         'merge-install': True,
     }
 }
+# Workspace folders found in the process, by Nanosaur home and folder name
+_WORKSPACE_PATHS = {}
 
 
 def get_nanosaur_version(params: utilities.Params, verbose=False) -> str:
@@ -55,23 +54,24 @@ def get_nanosaur_version(params: utilities.Params, verbose=False) -> str:
         version, tag = nanosaur_version.split('-')
         # tag_str = TerminalFormatter.color_text(tag, bold=True)
         if version not in nsv.NANOSAUR_DISTRO_MAP:
-            print(TerminalFormatter.color_text(f"Error: {nanosaur_version} is not a valid Nanosaur version", color='red'))
+            print(TerminalFormatter.red(f"Error: {nanosaur_version} is not a valid Nanosaur version"))
             sys.exit(1)
         if verbose:
-            print(TerminalFormatter.color_text(f"Warning: You are using a pre release version: {nanosaur_version}", color='yellow'))
+            print(TerminalFormatter.yellow(f"Warning: You are using a pre release version: {nanosaur_version}"))
         # Assign the version without the tag
         nanosaur_version = version
     elif nanosaur_version != nsv.NANOSAUR_CURRENT_DISTRO:
         if verbose:
-            print(TerminalFormatter.color_text(f"Warning: You are using a non-default Nanosaur version: {nanosaur_version}", color='yellow'))
+            print(TerminalFormatter.yellow(f"Warning: You are using a non-default Nanosaur version: {nanosaur_version}"))
     elif nanosaur_version not in nsv.NANOSAUR_DISTRO_MAP:
-        print(TerminalFormatter.color_text(f"Error: {nanosaur_version} is not a valid Nanosaur version", color='red'))
+        print(TerminalFormatter.red(f"Error: {nanosaur_version} is not a valid Nanosaur version"))
         sys.exit(1)
     return nanosaur_version
 
 
 def get_starting_location(params: utilities.Params) -> str:
     """Prompt the user to select the location to run the command."""
+    import inquirer
     # Get the nanosaur version
     nanosaur_version = params['nanosaur_version']
     # Get the ROS distro name
@@ -80,7 +80,7 @@ def get_starting_location(params: utilities.Params) -> str:
     debug_mode = None
     if 'ws_debug' in params:
         debug_mode = params['ws_debug']
-        print(TerminalFormatter.color_text(f"Default debug mode: {debug_mode}", color='yellow'))
+        print(TerminalFormatter.yellow(f"Default debug mode: {debug_mode}"))
     # Get the ROS 2 installation path if available
     ros2_installed = ros.get_ros2_path(ros_distro_name)
     debug_mode = 'docker' if ros2_installed is None else debug_mode
@@ -108,15 +108,15 @@ def requirements_info(params: utilities.Params, verbose: bool):
         nanosaur_version = nanosaur_version.split('-')[0]
         tag_version = params['nanosaur_version']
     # Get the nanosaur branch
-    nanosaur_version_string = TerminalFormatter.color_text("Nanosaur Version:", bold=True)
+    nanosaur_version_string = TerminalFormatter.bold("Nanosaur Version:")
     printed_version = tag_version or nanosaur_version
     if nanosaur_version != nsv.NANOSAUR_CURRENT_DISTRO:
-        print(TerminalFormatter.color_text(f"{nanosaur_version_string} {printed_version}", color='yellow'))
+        print(TerminalFormatter.yellow(f"{nanosaur_version_string} {printed_version}"))
     else:
         print(TerminalFormatter.color_text(f"{nanosaur_version_string} {printed_version}"))
 
     if tag_version:
-        print(TerminalFormatter.color_text(f"  Warning: You are using a tagged version based on {nanosaur_version}", color='yellow'))
+        print(TerminalFormatter.yellow(f"  Warning: You are using a tagged version based on {nanosaur_version}"))
 
     for key, default in nsv.NANOSAUR_DISTRO_MAP[nanosaur_version].items():
         value = params.get(key, default)
@@ -124,12 +124,12 @@ def requirements_info(params: utilities.Params, verbose: bool):
             if key == 'ros':
                 ros2_path = ros.get_ros2_path(value)
                 ros2_version_color = TerminalFormatter.color_text(value.capitalize(), color='yellow' if value != default else 'blue', bold=True)
-                version = TerminalFormatter.clickable_link(ros2_path) if ros2_path else TerminalFormatter.color_text('Not installed', color='red')
-                print(TerminalFormatter.color_text(f"  ROS 2 {ros2_version_color}: {version}", bold=True))
+                version = TerminalFormatter.clickable_link(ros2_path) if ros2_path else TerminalFormatter.red('Not installed')
+                print(TerminalFormatter.bold(f"  ROS 2 {ros2_version_color}: {version}"))
             else:
                 color = 'yellow' if value != default else None
                 key_display = key.replace('_', ' ').title().replace('Ros', 'ROS')
-                key_string = TerminalFormatter.color_text(f"{key_display}:", bold=True)
+                key_string = TerminalFormatter.bold(f"{key_display}:")
                 print(TerminalFormatter.color_text(f"  {key_string} {value}", color=color))
 
 
@@ -139,24 +139,27 @@ def workspaces_info(params: utilities.Params, verbose: bool):
     workspaces = get_workspaces_path(params)
     print()
     if workspaces:
-        print(TerminalFormatter.color_text("Installed Workspaces:", bold=True))
+        print(TerminalFormatter.bold("Installed Workspaces:"))
         for ws_name, ws_path in workspaces.items():
             # Get the workspace path if it exists
-            print(f"  {TerminalFormatter.color_text(ws_name, bold=True)}: {TerminalFormatter.clickable_link(ws_path)}")
+            print(f"  {TerminalFormatter.bold(ws_name)}: {TerminalFormatter.clickable_link(ws_path)}")
     elif verbose:
-        print(TerminalFormatter.color_text("No workspaces installed", bold=True))
+        print(TerminalFormatter.bold("No workspaces installed"))
 
 
-def parser_workspace_menu(subparsers: argparse._SubParsersAction, params: utilities.Params) -> argparse.ArgumentParser:
+def parser_workspace_menu(subparsers: argparse._SubParsersAction, params: utilities.Params, stub=False) -> argparse.ArgumentParser:
+    # Add workspace subcommand
+    parser_workspace = subparsers.add_parser(
+        'workspace', aliases=["ws"], help="Manage the Nanosaur workspace")
+    # Only the command, the workspace operations are added when selected
+    if stub:
+        return parser_workspace
     # Get the nanosaur version
     nanosaur_version = get_nanosaur_version(params)
     # Get the ROS distro name
     ros_distro_name = nsv.NANOSAUR_DISTRO_MAP[nanosaur_version]['ros']
     # Check if ROS 2 is installed
     ros2_installed = ros.get_ros2_path(ros_distro_name)
-    # Add workspace subcommand
-    parser_workspace = subparsers.add_parser(
-        'workspace', aliases=["ws"], help="Manage the Nanosaur workspace")
     workspace_subparsers = parser_workspace.add_subparsers(
         dest='workspace_type', help="Workspace types")
     # Add workspace clean subcommand
@@ -183,6 +186,7 @@ def parser_workspace_menu(subparsers: argparse._SubParsersAction, params: utilit
 
 def get_selected_workspace(params, workspace_actions, args):
     # Check if the workspace is provided as an argument
+    import inquirer
     if args.workspace is not None:
         return args.workspace
     # Get the workspaces
@@ -193,7 +197,7 @@ def get_selected_workspace(params, workspace_actions, args):
         workspaces['diagnostic'] = workspace_actions['diagnostic']
     # Check if there are any workspaces
     if not workspaces:
-        print(TerminalFormatter.color_text("No workspaces found.", color='red'))
+        print(TerminalFormatter.red("No workspaces found."))
         return None
     # Ask the user to select a workspace
     if len(workspaces) > 1:
@@ -216,17 +220,17 @@ def clean(platform, params: utilities.Params, args):
     if args.all:
         workspaces = get_workspaces_path(params)
         workspace_actions = {k: v for k, v in workspace_actions.items() if k in workspaces}
-        print(TerminalFormatter.color_text("Cleaning all workspaces", bold=True))
+        print(TerminalFormatter.bold("Cleaning all workspaces"))
         return all(action() for action in workspace_actions.values())
     # Get the workspace
     workspace = get_selected_workspace(params, workspace_actions, args)
     if workspace is None:
         return False
     # Clean the workspace
-    print(TerminalFormatter.color_text(f"Cleaning {workspace}", bold=True))
+    print(TerminalFormatter.bold(f"Cleaning {workspace}"))
     if action := workspace_actions.get(workspace):
         return action()
-    print(TerminalFormatter.color_text(f"I cannot clean this {workspace}", color='red'))
+    print(TerminalFormatter.red(f"I cannot clean this {workspace}"))
     return False
 
 
@@ -254,11 +258,11 @@ def update(platform, params: utilities.Params, args):
         url = f"{nanosaur_raw_url}/nanosaur/rosinstall/{workspace_type}.rosinstall"
         rosinstall_path = utilities.download_file(url, shared_src_path, f"{workspace_type}.rosinstall", force)
         if rosinstall_path is not None:
-            print(TerminalFormatter.color_text(f"Update {workspace_type}.rosinstall", bold=True))
+            print(TerminalFormatter.bold(f"Update {workspace_type}.rosinstall"))
         else:
-            print(TerminalFormatter.color_text(f"Failed to download {workspace_type}.rosinstall", color='red'))
+            print(TerminalFormatter.red(f"Failed to download {workspace_type}.rosinstall"))
         if os.path.exists(rosinstall_path):
-            print(TerminalFormatter.color_text(f"Found rosinstall file: {rosinstall_path}", bold=True))
+            print(TerminalFormatter.bold(f"Found rosinstall file: {rosinstall_path}"))
             if not ros.rosinstall_reader(nanosaur_home_path, rosinstall_path, src_folder="shared_src", tag_version=tag_version):
                 return False
         return True
@@ -267,7 +271,7 @@ def update(platform, params: utilities.Params, args):
     def update_workspace(params, workspace_type, workspace_name_key, force, skip_rosinstall_update=False):
         workspace_path = get_workspace_path(params, workspace_name_key)
         if not workspace_path:
-            print(TerminalFormatter.color_text(f"Workspace {workspace_type} not found", color='red'))
+            print(TerminalFormatter.red(f"Workspace {workspace_type} not found"))
             return False
         rosinstall_path = os.path.join(workspace_path, f"{workspace_type}.rosinstall")
         if not skip_rosinstall_update:
@@ -275,13 +279,13 @@ def update(platform, params: utilities.Params, args):
             url = f"{nanosaur_raw_url}/nanosaur/rosinstall/{workspace_type}.rosinstall"
             rosinstall_path = utilities.download_file(url, workspace_path, f"{workspace_type}.rosinstall", force)
             if rosinstall_path is not None:
-                print(TerminalFormatter.color_text(f"Update {workspace_type}.rosinstall", bold=True))
+                print(TerminalFormatter.bold(f"Update {workspace_type}.rosinstall"))
             else:
-                print(TerminalFormatter.color_text(f"Failed to download {workspace_type}.rosinstall", color='red'))
+                print(TerminalFormatter.red(f"Failed to download {workspace_type}.rosinstall"))
                 return False
         # run vcs import to sync the workspace
         if os.path.exists(rosinstall_path):
-            print(TerminalFormatter.color_text(f"Found rosinstall file: {rosinstall_path}", bold=True))
+            print(TerminalFormatter.bold(f"Found rosinstall file: {rosinstall_path}"))
             if not ros.rosinstall_reader(workspace_path, rosinstall_path, tag_version=tag_version):
                 return False
         return True
@@ -293,10 +297,10 @@ def update(platform, params: utilities.Params, args):
         'perception': lambda: update_workspace(params, 'perception', 'ws_perception_name', args.force),
     }
     if args.all:
-        print(TerminalFormatter.color_text("Updating isaac_ros_common repository", bold=True))
+        print(TerminalFormatter.bold("Updating isaac_ros_common repository"))
         isaac_ros_branch = params.get('isaac_ros_branch', nsv.NANOSAUR_DISTRO_MAP[nanosaur_version]['isaac_ros_release'])
         ros.manage_isaac_ros_common_repo(nanosaur_home_path, isaac_ros_branch, args.force)
-        print(TerminalFormatter.color_text("Updating all workspaces", bold=True))
+        print(TerminalFormatter.bold("Updating all workspaces"))
         update_shared_workspace(args.force)
         workspaces = get_workspaces_path(params)
         workspace_actions = {k: v for k, v in workspace_actions.items() if k in workspaces}
@@ -306,14 +310,14 @@ def update(platform, params: utilities.Params, args):
     if workspace is None:
         return False
     # Update the workspace
-    print(TerminalFormatter.color_text("Updating isaac_ros_common repository", bold=True))
+    print(TerminalFormatter.bold("Updating isaac_ros_common repository"))
     isaac_ros_branch = params.get('isaac_ros_branch', nsv.NANOSAUR_DISTRO_MAP[nanosaur_version]['isaac_ros_release'])
     ros.manage_isaac_ros_common_repo(nanosaur_home_path, isaac_ros_branch, args.force)
-    print(TerminalFormatter.color_text(f"Updating {workspace}", bold=True))
+    print(TerminalFormatter.bold(f"Updating {workspace}"))
     if action := workspace_actions.get(workspace):
         update_shared_workspace(args.force)
         return action()
-    print(TerminalFormatter.color_text(f"Workspace {workspace} not found", color='red'))
+    print(TerminalFormatter.red(f"Workspace {workspace} not found"))
     return False
 
 
@@ -331,14 +335,14 @@ def build(platform, params: utilities.Params, args):
         shared_src_path = get_shared_workspace_path()
         if not workspace_path:
             return False
-        print(TerminalFormatter.color_text(f"- Install all dependencies on workspace {workspace_path}", bold=True))
+        print(TerminalFormatter.bold(f"- Install all dependencies on workspace {workspace_path}"))
         ros2_path = ros.get_ros2_path(ros_distro_name)
         if not ros.run_rosdep(ros2_path, workspace_path, shared_src_path):
-            print(TerminalFormatter.color_text("Failed to install dependencies", color='red'))
+            print(TerminalFormatter.red("Failed to install dependencies"))
             return False
-        print(TerminalFormatter.color_text(f"- Build workspace {workspace_path}", bold=True))
+        print(TerminalFormatter.bold(f"- Build workspace {workspace_path}"))
         if not ros.run_colcon_build(ros2_path, workspace_path):
-            print(TerminalFormatter.color_text(f"Failed to build workspace {workspace_path}", color='red'))
+            print(TerminalFormatter.red(f"Failed to build workspace {workspace_path}"))
             return False
         return True
     # Build the workspace
@@ -348,27 +352,30 @@ def build(platform, params: utilities.Params, args):
     if args.all:
         workspaces = get_workspaces_path(params)
         workspace_actions = {k: v for k, v in workspace_actions.items() if k in workspaces}
-        print(TerminalFormatter.color_text("Building all workspaces", bold=True))
+        print(TerminalFormatter.bold("Building all workspaces"))
         return all(action() for action in workspace_actions.values())
     # Get the workspace
     workspace = get_selected_workspace(params, workspace_actions, args)
     if workspace is None:
         return False
     # Build the workspace
-    print(TerminalFormatter.color_text(f"Building {workspace}", bold=True))
+    print(TerminalFormatter.bold(f"Building {workspace}"))
     if action := workspace_actions.get(workspace):
         return action()
-    print(TerminalFormatter.color_text(f"Workspace {workspace} not found", color='red'))
+    print(TerminalFormatter.red(f"Workspace {workspace} not found"))
     return False
 
 
 def debug(platform, params: utilities.Params, args):
     """ Debug the workspace """
+    import inquirer
+    from nanosaur.docker import docker_service_run_command
+    from nanosaur.simulation import simulation_robot_start_debug, simulation_start_debug
     # Get the debug mode
     debug_mode = None
     if 'ws_debug' in params:
         debug_mode = params['ws_debug']
-        print(TerminalFormatter.color_text(f"Default debug mode: {debug_mode}", color='yellow'))
+        print(TerminalFormatter.yellow(f"Default debug mode: {debug_mode}"))
     # Get the nanosaur version
     nanosaur_version = params['nanosaur_version']
     # Get the ROS distro name
@@ -407,7 +414,7 @@ def debug(platform, params: utilities.Params, args):
         nanosaur_shared_src = os.path.join(nanosaur_home_path, "shared_src")
         simulation_ws_path = get_workspace_path(params, 'ws_simulation_name')
 
-        print(TerminalFormatter.color_text(f"Debugging {selected_launcher} in {selected_location} {options_str}", bold=True))
+        print(TerminalFormatter.bold(f"Debugging {selected_launcher} in {selected_location} {options_str}"))
         # Debug the simulation workspace
         if selected_location == 'host':
             # Debug locally
@@ -465,12 +472,13 @@ def debug(platform, params: utilities.Params, args):
     # print(TerminalFormatter.color_text(f"Debugging {workspace}", bold=True))
     if action := workspace_actions.get(workspace):
         return action()
-    print(TerminalFormatter.color_text(f"I cannot debug this {workspace}", color='red'))
+    print(TerminalFormatter.red(f"I cannot debug this {workspace}"))
     return False
 
 
 def deploy(platform, params: utilities.Params, args, push=False, release=None):
     """ Deploy the workspace """
+    import inquirer
     # determine the device type
     device_type = "robot" if platform['Machine'] == 'aarch64' else "desktop"
     # Get the Nanosaur docker user
@@ -576,29 +584,47 @@ def deploy(platform, params: utilities.Params, args, push=False, release=None):
         # Always deploy the diagnostic workspace in a desktop environment
         if params['mode'] in ['maintainer', 'Raffo']:
             workspace_run['diagnostic'] = workspace_actions['diagnostic']
-        print(TerminalFormatter.color_text("Deploying all workspaces", bold=True))
+        print(TerminalFormatter.bold("Deploying all workspaces"))
         return all(action() for action in workspace_run.values())
     # Get the workspace
     workspace = get_selected_workspace(params, workspace_actions, args)
     if workspace is None:
         return False
     # Deploy the workspace
-    print(TerminalFormatter.color_text(f"Deploying {workspace}", bold=True))
+    print(TerminalFormatter.bold(f"Deploying {workspace}"))
     if action := workspace_actions.get(workspace):
         return action()
-    print(TerminalFormatter.color_text(f"I cannot deploy this {workspace}", color='red'))
+    print(TerminalFormatter.red(f"I cannot deploy this {workspace}"))
     return False
 
 
-def get_workspaces_path(params: utilities.Params) -> dict:
-    nanosaur_home_path = utilities.get_nanosaur_home()
-    # Add all workspaces that exist in the Nanosaur home folder
-    workspaces = {
+def _workspaces_name(params: utilities.Params) -> dict:
+    return {
         'ws_developer_name': params.get('ws_developer_name', nsv.DEFAULT_WORKSPACE_DEVELOPER),
         'ws_robot_name': params.get('ws_robot_name', nsv.DEFAULT_WORKSPACE_ROBOT),
         'ws_simulation_name': params.get('ws_simulation_name', nsv.DEFAULT_WORKSPACE_SIMULATION),
         'ws_perception_name': params.get('ws_perception_name', nsv.DEFAULT_WORKSPACE_PERCEPTION)
     }
+
+
+def workspaces_exist(params: utilities.Params) -> bool:
+    """Return True as soon as one workspace is found in the Nanosaur home folder."""
+    nanosaur_home_path = utilities.get_nanosaur_home()
+    paths = set(_workspaces_name(params).values())
+    # Workspaces in a sub folder or outside the home are checked one by one
+    if any(os.path.exists(os.path.join(nanosaur_home_path, path)) for path in paths if os.sep in path):
+        return True
+    try:
+        with os.scandir(nanosaur_home_path) as entries:
+            return any(entry.name in paths for entry in entries)
+    except OSError:
+        return False
+
+
+def get_workspaces_path(params: utilities.Params) -> dict:
+    nanosaur_home_path = utilities.get_nanosaur_home()
+    # Add all workspaces that exist in the Nanosaur home folder
+    workspaces = _workspaces_name(params)
     return {
         name.split('_')[1]: os.path.join(nanosaur_home_path, path)
         for name, path in workspaces.items()
@@ -617,13 +643,18 @@ def get_workspace_path(params: utilities.Params, ws_name) -> str:
     if ws_name not in workspaces:
         return None
     ws_name_folder = workspaces[ws_name]
+    # Workspaces already found are not checked again, they are never removed while running
+    key = (utilities.get_nanosaur_home(), ws_name_folder)
+    if key in _WORKSPACE_PATHS:
+        return _WORKSPACE_PATHS[key]
     # Create the Nanosaur home folder
     nanosaur_home_path = utilities.create_nanosaur_home()
     # Create the full path for the workspace folder in the user's home directory
     workspace_path = os.path.join(nanosaur_home_path, ws_name_folder)
 
     # Check if the workspace folder exists
-    if os.path.exists(workspace_path) and os.path.isdir(workspace_path):
+    if os.path.isdir(workspace_path):
+        _WORKSPACE_PATHS[key] = workspace_path
         return workspace_path
     else:
         return None
@@ -641,9 +672,9 @@ def create_workspace(nanosaur_home_path, ws_name, skip_create_colcon_setting=Fal
     # Check if folder exists, if not, create it
     if not os.path.exists(ws_name_path_src):
         os.makedirs(ws_name_path_src)
-        print(TerminalFormatter.color_text(f"Workspace '{ws_name}' created in {nanosaur_home_path}.", color='green'))
+        print(TerminalFormatter.green(f"Workspace '{ws_name}' created in {nanosaur_home_path}."))
     else:
-        print(TerminalFormatter.color_text(f"Workspace '{ws_name}' already exists.", color='yellow'))
+        print(TerminalFormatter.yellow(f"Workspace '{ws_name}' already exists."))
     # Save the default colcon settings
     if not skip_create_colcon_setting:
         with open(f"{ws_name_path}/colcon_defaults.yaml", 'w') as file:
@@ -678,15 +709,15 @@ def clean_workspace(nanosaur_ws_name) -> bool:
         subfolders_exist = all(os.path.exists(os.path.join(workspace_path, subfolder)) for subfolder in subfolders)
 
         if subfolders_exist:
-            print(TerminalFormatter.color_text(f"Workspace '{workspace_path}' and subfolders exist. Cleaning build, install and log folders", color='yellow'))
+            print(TerminalFormatter.yellow(f"Workspace '{workspace_path}' and subfolders exist. Cleaning build, install and log folders"))
             try:
                 os.system(f"rm -Rf {workspace_path}/build {workspace_path}/install {workspace_path}/log")
-                print(TerminalFormatter.color_text(f"Workspace '{workspace_path}' cleaned up.", color='green'))
+                print(TerminalFormatter.green(f"Workspace '{workspace_path}' cleaned up."))
             except Exception as e:
-                print(TerminalFormatter.color_text(f"Error running rm {str(e)}", color='red'))
+                print(TerminalFormatter.red(f"Error running rm {str(e)}"))
                 return False
         else:
-            print(TerminalFormatter.color_text(f"Workspace '{workspace_path}' does not contain build, install and log folders.", color='yellow'))
+            print(TerminalFormatter.yellow(f"Workspace '{workspace_path}' does not contain build, install and log folders."))
     return True
 
 
@@ -737,11 +768,12 @@ def create_maintainer_workspace(platform, params: utilities.Params, args) -> boo
     device_type = "robot" if platform['Machine'] == 'aarch64' else "desktop"
     # Create the Nanosaur home folder
     nanosaur_home_path = utilities.create_nanosaur_home()
-    # Store nanosaur distro and Isaac ROS distro
+    # Store nanosaur distro and Isaac ROS distro, written with the nanosaur version before the workspaces are built
     nanosaur_branch = nsv.NANOSAUR_DISTRO_MAP[nanosaur_version]['nanosaur_branch']
-    params['nanosaur_branch'] = params.get('nanosaur_branch', nanosaur_branch)
     isaac_ros_branch = nsv.NANOSAUR_DISTRO_MAP[nanosaur_version]['isaac_ros_release']
-    params['isaac_ros_branch'] = params.get('isaac_ros_branch', isaac_ros_branch)
+    with params.batch():
+        params['nanosaur_branch'] = params.get('nanosaur_branch', nanosaur_branch)
+        params['isaac_ros_branch'] = params.get('isaac_ros_branch', isaac_ros_branch)
     # Create the shared source folder
     create_shared_workspace()
     if device_type == "robot" or args.all:
@@ -772,16 +804,16 @@ def create_maintainer_workspace(platform, params: utilities.Params, args) -> boo
         if os.path.exists(docker_compose_path) and not os.path.islink(docker_compose_path):
             old_path = f"{docker_compose_path}.old"
             os.rename(docker_compose_path, old_path)
-            print(TerminalFormatter.color_text(f"Renamed existing {docker_compose_file} to {old_path}", color='yellow'))
+            print(TerminalFormatter.yellow(f"Renamed existing {docker_compose_file} to {old_path}"))
         # Create a symlink to the new docker-compose file
         new_path = os.path.join(nanosaur_home_path, 'shared_src', 'nanosaur', docker_compose_file)
         if not os.path.exists(new_path):
-            print(TerminalFormatter.color_text(f"Could not find {docker_compose_file} in {new_path}", color='red'))
+            print(TerminalFormatter.red(f"Could not find {docker_compose_file} in {new_path}"))
             return False
         if os.path.exists(docker_compose_path):
             os.remove(docker_compose_path)
         os.symlink(new_path, docker_compose_path)
-        print(TerminalFormatter.color_text(f"Created symlink for {docker_compose_file} to {new_path}", color='green'))
+        print(TerminalFormatter.green(f"Created symlink for {docker_compose_file} to {new_path}"))
         return True
 
     # Check if docker-compose files exist